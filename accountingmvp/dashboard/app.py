@@ -6,20 +6,26 @@ Main Streamlit application for the payment reconciliation system.
 Run with: streamlit run dashboard/app.py
 """
 
+import hashlib
+import io
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-
-import pandas as pd
 import streamlit as st
 
 from src.models.enums import MatchStatus, TransactionSource
-from src.normalizer import DataValidator, NormalizationPipeline
-from src.parsers import BankCSVParser, ParserFactory
-from src.reconciliation import ReconciliationEngine, ReportGenerator
+
+# Parsing/matching modules (and pandas) are imported inside the functions that
+# use them: Streamlit re-executes this script on every interaction, and the
+# welcome screen should not pay for them.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.reconciliation import TextScoreCache
 
 # Page config
 st.set_page_config(
@@ -38,9 +44,6 @@ st.markdown(
         padding: 10px;
         border-radius: 5px;
     }
-    .match-high { color: #28a745; font-weight: bold; }
-    .match-medium { color: #ffc107; font-weight: bold; }
-    .match-low { color: #dc3545; font-weight: bold; }
 </style>
 """,
     unsafe_allow_html=True,
@@ -57,30 +60,37 @@ def init_session_state():
         st.session_state.matches = None
     if "summary" not in st.session_state:
         st.session_state.summary = None
+    if "review_decisions" not in st.session_state:
+        st.session_state.review_decisions = {}
 
 
-def parse_uploaded_file(uploaded_file, source_type: TransactionSource):
-    """Parse an uploaded file and return normalized transactions."""
-    # Read content
-    content = uploaded_file.read().decode("utf-8")
+@st.cache_data(show_spinner=False)
+def parse_uploaded_bytes(content: bytes, filename: str, source_type: TransactionSource):
+    """
+    Parse uploaded file bytes and return normalized transactions.
 
-    # Save temporarily
-    temp_path = f"/tmp/{uploaded_file.name}"
-    with open(temp_path, "w") as f:
-        f.write(content)
+    Cached on the file bytes, so Streamlit reruns triggered by widget
+    interactions do not re-parse an unchanged upload.
+    """
+    from src.normalizer import DataValidator, NormalizationPipeline
+    from src.parsers import BankCSVParser, ParserFactory
+
+    # Parse straight from memory; the name drives format detection
+    buffer = io.BytesIO(content)
+    buffer.name = filename
 
     # Get parser
-    parser = ParserFactory.get_parser(temp_path)
+    parser = ParserFactory.get_parser(buffer)
     if not parser:
         # Fallback to bank CSV parser
         parser = BankCSVParser()
 
-    # Parse
-    raw_transactions = parser.parse(temp_path)
+    # Parse straight into columns, skipping per-row RawTransaction objects
+    raw_frame = parser.parse_frame(buffer)
 
     # Normalize
     pipeline = NormalizationPipeline(source_type)
-    normalized = pipeline.process(raw_transactions)
+    normalized = pipeline.process_frame(raw_frame)
 
     # Validate
     validator = DataValidator()
@@ -89,6 +99,53 @@ def parse_uploaded_file(uploaded_file, source_type: TransactionSource):
     return valid, invalid, validator.get_report()
 
 
+def parse_uploaded_file(uploaded_file, source_type: TransactionSource):
+    """Parse an uploaded file and return normalized transactions."""
+    return parse_uploaded_bytes(
+        uploaded_file.getvalue(), uploaded_file.name, source_type
+    )
+
+
+def transactions_digest(transactions) -> str:
+    """Cheap cache key for a list of transactions, derived from their IDs."""
+    digest = hashlib.blake2b(digest_size=16)
+    for txn in transactions:
+        digest.update(txn.id.encode())
+    return digest.hexdigest()
+
+
+@st.cache_resource(max_entries=4)
+def text_score_cache(source_key: str, target_key: str) -> "TextScoreCache":
+    """Text similarity cache shared by every run over the same inputs."""
+    from src.reconciliation import TextScoreCache
+
+    return TextScoreCache()
+
+
+@st.cache_data(show_spinner=False)
+def run_reconciliation(
+    source_key: str,
+    target_key: str,
+    confidence_threshold: float,
+    _source_txns,
+    _target_txns,
+):
+    """
+    Run the reconciliation engine, cached on the input digests.
+
+    The transaction lists are excluded from Streamlit's argument hashing
+    (leading underscore); ``source_key``/``target_key`` identify them.
+    """
+    from src.reconciliation import ReconciliationEngine
+
+    # Moving the threshold slider re-runs this; fuzzy text scores carry over
+    engine = ReconciliationEngine(
+        confidence_threshold=confidence_threshold,
+        text_cache=text_score_cache(source_key, target_key),
+    )
+    return engine.reconcile(_source_txns, _target_txns)
+
+
 def render_sidebar():
     """Render the sidebar with file upload."""
     st.sidebar.header("📁 Upload Files")
@@ -126,7 +183,7 @@ def render_sidebar():
     return source_file, target_file, confidence_threshold
 
 
-def render_data_preview(df: pd.DataFrame, title: str):
+def render_data_preview(df: "pd.DataFrame", title: str):
     """Render a data preview section."""
     with st.expander(f"📊 {title} ({len(df)} rows)", expanded=False):
         st.dataframe(df, use_container_width=True)
@@ -151,6 +208,90 @@ def render_summary_metrics(summary):
         st.metric("💰 Matched Amount", f"${summary.total_matched_amount:,.2f}")
 
 
+def confidence_color(score: float) -> str:
+    """CSS color for a confidence score cell."""
+    if score >= 0.9:
+        return "color: #28a745; font-weight: bold"
+    if score >= 0.7:
+        return "color: #ffc107; font-weight: bold"
+    return "color: #dc3545; font-weight: bold"
+
+
+def matches_frame(matches) -> "pd.DataFrame":
+    """Build a display table of match results, one row per match."""
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "Source": [m.source_transaction.description for m in matches],
+            "Source Amount": [m.source_transaction.amount_cents / 100 for m in matches],
+            "Source Date": [m.source_transaction.transaction_date for m in matches],
+            "Target": [m.target_transaction.description for m in matches],
+            "Target Amount": [m.target_transaction.amount_cents / 100 for m in matches],
+            "Target Date": [m.target_transaction.transaction_date for m in matches],
+            "Confidence": [m.score.total_score for m in matches],
+        }
+    )
+
+
+def render_matches_table(matches):
+    """Render matches as a single virtualized, styled dataframe."""
+    styled = (
+        matches_frame(matches)
+        .style.map(confidence_color, subset=["Confidence"])
+        .format(
+            {
+                "Source Amount": "${:,.2f}",
+                "Target Amount": "${:,.2f}",
+                "Confidence": "{:.0%}",
+            }
+        )
+    )
+    st.dataframe(styled, use_container_width=True, height=500, hide_index=True)
+
+
+@st.fragment
+def render_review_editor(review):
+    """Render the manual review queue with bulk approve/reject checkboxes.
+
+    Runs as a fragment: saving decisions reruns only this editor, not the
+    whole page (uploads, reconciliation and the other tabs are left alone).
+    """
+    decisions = st.session_state.review_decisions
+    saved = [decisions.get(m.source_transaction.id) for m in review]
+    df = matches_frame(review)
+    df.insert(0, "Approve", [d is True for d in saved])
+    df.insert(1, "Reject", [d is False for d in saved])
+
+    with st.form("review_form"):
+        edited = st.data_editor(
+            df,
+            use_container_width=True,
+            height=500,
+            hide_index=True,
+            disabled=[c for c in df.columns if c not in ("Approve", "Reject")],
+            column_config={
+                "Approve": st.column_config.CheckboxColumn("✅ Approve"),
+                "Reject": st.column_config.CheckboxColumn("❌ Reject"),
+                "Confidence": st.column_config.ProgressColumn(
+                    "Confidence", min_value=0, max_value=1, format="percent"
+                ),
+            },
+        )
+        submitted = st.form_submit_button("💾 Save decisions")
+
+    if submitted:
+        approved = edited.index[edited["Approve"]].tolist()
+        rejected = edited.index[edited["Reject"] & ~edited["Approve"]].tolist()
+        for i in approved:
+            decisions[review[i].source_transaction.id] = True
+        for i in rejected:
+            decisions[review[i].source_transaction.id] = False
+        for i in edited.index[~edited["Approve"] & ~edited["Reject"]]:
+            decisions.pop(review[i].source_transaction.id, None)
+        st.success(f"Approved {len(approved)}, rejected {len(rejected)} matches.")
+
+
 def render_match_results(matches, summary):
     """Render match results."""
     st.header("📋 Reconciliation Results")
@@ -163,84 +304,38 @@ def render_match_results(matches, summary):
     # Tabs for different match statuses
     tab1, tab2, tab3 = st.tabs(["✅ Matched", "🔍 Manual Review", "❌ Unmatched"])
 
-    matched = [m for m in matches if m.status == MatchStatus.MATCHED]
-    review = [m for m in matches if m.status == MatchStatus.MANUAL_REVIEW]
-    unmatched = [m for m in matches if m.status == MatchStatus.UNMATCHED]
+    # Bucket by status in a single pass
+    buckets: dict[MatchStatus, list] = {status: [] for status in MatchStatus}
+    for m in matches:
+        buckets[m.status].append(m)
+    matched = buckets[MatchStatus.MATCHED]
+    review = buckets[MatchStatus.MANUAL_REVIEW]
+    unmatched = buckets[MatchStatus.UNMATCHED]
 
     with tab1:
         if matched:
-            for m in matched[:50]:  # Limit display
-                with st.container():
-                    col1, col2, col3 = st.columns([4, 4, 2])
-                    with col1:
-                        st.markdown(
-                            f"**Source:** {m.source_transaction.description[:40]}..."
-                        )
-                        st.caption(
-                            f"${m.source_transaction.amount} | {m.source_transaction.transaction_date}"
-                        )
-                    with col2:
-                        st.markdown(
-                            f"**Target:** {m.target_transaction.description[:40]}..."
-                        )
-                        st.caption(
-                            f"${m.target_transaction.amount} | {m.target_transaction.transaction_date}"
-                        )
-                    with col3:
-                        st.markdown(
-                            f"<span class='match-high'>{m.score.total_score:.0%}</span>",
-                            unsafe_allow_html=True,
-                        )
-                    st.divider()
+            render_matches_table(matched)
         else:
             st.info("No automatic matches found.")
 
     with tab2:
         if review:
-            for m in review[:50]:
-                with st.container():
-                    col1, col2, col3, col4 = st.columns([3, 3, 2, 2])
-                    with col1:
-                        st.markdown(
-                            f"**Source:** {m.source_transaction.description[:30]}..."
-                        )
-                        st.caption(f"${m.source_transaction.amount}")
-                    with col2:
-                        st.markdown(
-                            f"**Target:** {m.target_transaction.description[:30]}..."
-                        )
-                        st.caption(f"${m.target_transaction.amount}")
-                    with col3:
-                        st.markdown(
-                            f"<span class='match-medium'>{m.score.total_score:.0%}</span>",
-                            unsafe_allow_html=True,
-                        )
-                    with col4:
-                        if st.button(
-                            "✅ Approve", key=f"approve_{m.source_transaction.id}"
-                        ):
-                            st.success("Approved!")
-                        if st.button(
-                            "❌ Reject", key=f"reject_{m.source_transaction.id}"
-                        ):
-                            st.warning("Rejected")
-                    st.divider()
+            render_review_editor(review)
         else:
             st.success("No items require manual review!")
 
     with tab3:
         if unmatched:
             st.warning(f"{len(unmatched)} transactions could not be matched.")
-            for m in unmatched[:20]:
-                st.text(
-                    f"• {m.source_transaction.description[:50]} - ${m.source_transaction.amount}"
-                )
+            render_matches_table(unmatched)
         else:
             st.success("All transactions matched!")
 
 
 def render_download_section(matches, summary):
     """Render report download section."""
+    from src.reconciliation import ReportGenerator
+
     st.header("📥 Download Report")
 
     col1, col2 = st.columns(2)
@@ -305,10 +400,13 @@ def main():
                         )
 
                     # Run reconciliation
-                    engine = ReconciliationEngine(
-                        confidence_threshold=confidence_threshold
+                    matches, summary = run_reconciliation(
+                        transactions_digest(source_txns),
+                        transactions_digest(target_txns),
+                        confidence_threshold,
+                        source_txns,
+                        target_txns,
                     )
-                    matches, summary = engine.reconcile(source_txns, target_txns)
 
                     st.session_state.matches = matches
                     st.session_state.summary = summary
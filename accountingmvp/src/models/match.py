@@ -1,8 +1,10 @@
 """Match result models for reconciliation."""
 
 from decimal import Decimal
+from functools import cached_property
+from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .enums import MatchConfidence, MatchStatus
 from .transaction import NormalizedTransaction
@@ -11,6 +13,11 @@ from .transaction import NormalizedTransaction
 class MatchScore(BaseModel):
     """Detailed breakdown of match scoring."""
 
+    # Immutable so the total/confidence cached below match the fields. The one
+    # way round that is model_copy(update=...), which copies the cache without
+    # running __init__, so it is overridden to re-derive them
+    model_config = ConfigDict(frozen=True)
+
     amount_score: float = Field(ge=0, le=1, description="Amount similarity (0-1)")
     text_score: float = Field(
         ge=0, le=1, description="Description/ref similarity (0-1)"
@@ -20,17 +27,42 @@ class MatchScore(BaseModel):
         ge=0, le=0.1, description="Exact reference match bonus"
     )
 
-    @property
+    def model_post_init(self, __context: Any) -> None:
+        # Derive once at construction (confidence reads total_score, so both
+        # are cached); later reads are plain __dict__ lookups
+        _ = self.confidence
+
+    def model_copy(
+        self, *, update: dict[str, Any] | None = None, deep: bool = False
+    ) -> "MatchScore":
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            # The copied __dict__ still holds this score's cached values
+            copy.__dict__.pop("total_score", None)
+            copy.__dict__.pop("confidence", None)
+            _ = copy.confidence
+        return copy
+
+    @staticmethod
+    def weighted_total(
+        amount_score: float,
+        text_score: float,
+        date_score: float,
+        reference_bonus: float,
+    ) -> float:
+        """Weighted total of component scores, without building a MatchScore."""
+        return (
+            0.4 * amount_score + 0.3 * text_score + 0.2 * date_score + reference_bonus
+        )
+
+    @cached_property
     def total_score(self) -> float:
         """Calculate weighted total score."""
-        return (
-            0.4 * self.amount_score
-            + 0.3 * self.text_score
-            + 0.2 * self.date_score
-            + self.reference_bonus
+        return self.weighted_total(
+            self.amount_score, self.text_score, self.date_score, self.reference_bonus
         )
 
-    @property
+    @cached_property
     def confidence(self) -> MatchConfidence:
         """Determine confidence level from score."""
         score = self.total_score
@@ -1,7 +1,9 @@
+import sys
+from dataclasses import dataclass, field
 from datetime import date
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel
 
 
 class RawTransaction(BaseModel):
@@ -15,16 +17,49 @@ class RawTransaction(BaseModel):
     line_number: int
 
 
-class NormalizedTransaction(BaseModel):
-    """Standardized transaction schema for the ledger."""
+@dataclass(frozen=True, slots=True)
+class NormalizedTransaction:
+    """
+    Standardized transaction schema for the ledger.
 
-    model_config = ConfigDict(frozen=True)
+    A plain slotted dataclass rather than a Pydantic model: instances are
+    only built by the normalization pipeline from already-parsed values,
+    so per-row validation would be pure overhead.
+    """
 
-    id: str = Field(..., description="Unique hash of the transaction")
+    id: str  # Unique hash of the transaction
     transaction_date: date
     amount: Decimal
     reference: str
     description: str
-    source: str
+    source: str  # TransactionSource value, e.g. "bank_statement"
     currency: str = "USD"
-    metadata: dict = Field(default_factory=dict)
+    metadata: dict = field(default_factory=dict)
+    # Amount in integer minor units, derived once so matching and totals can
+    # use native int arithmetic; ``amount`` stays the exact ledger value
+    amount_cents: int = field(init=False, repr=False, compare=False)
+    # Text keys for matching, normalized once instead of once per compared
+    # pair: lowercased/stripped fields (None when empty, as
+    # FuzzyTextMatcher.normalize) and the uppercased reference. They are
+    # interned, so recurring descriptors share one string object and
+    # dict/cache lookups on them mostly settle on an identity check.
+    match_description: str | None = field(init=False, repr=False, compare=False)
+    match_reference: str | None = field(init=False, repr=False, compare=False)
+    reference_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        cents = self.amount.scaleb(2).to_integral_value(rounding=ROUND_HALF_UP)
+        object.__setattr__(self, "amount_cents", int(cents))
+        object.__setattr__(
+            self,
+            "match_description",
+            sys.intern(self.description.lower().strip()) if self.description else None,
+        )
+        object.__setattr__(
+            self,
+            "match_reference",
+            sys.intern(self.reference.lower().strip()) if self.reference else None,
+        )
+        object.__setattr__(
+            self, "reference_key", sys.intern(self.reference.strip().upper())
+        )
@@ -1,10 +1,10 @@
 """Data normalization pipeline."""
 
-import hashlib
-from datetime import date
-from decimal import Decimal, InvalidOperation
+import re
+from decimal import Decimal
 
-from dateutil import parser as date_parser
+import numpy as np
+import pandas as pd
 
 from src.logger import setup_logger
 from src.models.enums import TransactionSource
@@ -12,12 +12,35 @@ from src.models.transaction import NormalizedTransaction, RawTransaction
 
 logger = setup_logger(__name__)
 
+# Currency symbols, thousands separators and whitespace, removed in one pass
+_AMOUNT_STRIP_RE = re.compile(r"[$£€,\s]")
+# Decimal literal left after stripping currency symbols and separators,
+# optionally in exponent notation ("1e5", "1.5E+3") as Decimal() accepts it
+_AMOUNT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+# Common statement date formats, tried exactly before falling back to
+# dateutil-style inference. None of them overlap, so order only affects speed.
+# "%d %b %Y" covers "17 Jan 2024", which inference parses several times slower.
+_FAST_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d %b %Y")
+# Whitespace removed from references
+_REFERENCE_WHITESPACE = str.maketrans("", "", " \t\n\r")
+
+
+def _infer_date(value: str) -> pd.Timestamp:
+    """Infer one date (NaT if unparseable), dropping any offset."""
+    try:
+        parsed = pd.to_datetime(value, dayfirst=True, errors="coerce", format="mixed")
+    except (TypeError, ValueError):
+        return pd.NaT
+    if parsed is not pd.NaT and parsed.tzinfo is not None:
+        parsed = parsed.tz_localize(None)
+    return parsed
+
 
 class NormalizationPipeline:
     """
     Pipeline for transforming raw transactions into normalized format.
 
-    Stages:
+    Stages (each applied column-wise over the whole batch):
     1. Parse date strings to date objects
     2. Parse amounts to Decimal
     3. Clean and standardize references
@@ -27,7 +50,9 @@ class NormalizationPipeline:
 
     def __init__(self, source: TransactionSource):
         self.source = source
-        self._seen_hashes: set[str] = set()
+        # Sorted dedupe keys from earlier batches processed by this instance
+        self._seen_keys = np.empty(0, dtype=np.uint64)
+        self._preferred_date_format: str | None = None
 
     def process(
         self, raw_transactions: list[RawTransaction]
@@ -41,88 +66,169 @@ class NormalizationPipeline:
         Returns:
             List of normalized, deduplicated transactions
         """
-        normalized = []
+        if not raw_transactions:
+            return []
+
+        return self.process_frame(
+            pd.DataFrame(
+                {
+                    "raw_date": [r.raw_date for r in raw_transactions],
+                    "raw_amount": [r.raw_amount for r in raw_transactions],
+                    "raw_reference": [r.raw_reference for r in raw_transactions],
+                    "description": [r.description for r in raw_transactions],
+                    "source_file": [r.source_file for r in raw_transactions],
+                    "line_number": [r.line_number for r in raw_transactions],
+                }
+            )
+        )
+
+    def process_frame(self, df: pd.DataFrame) -> list[NormalizedTransaction]:
+        """
+        Process a raw transaction frame (see BaseParser.parse_frame).
+
+        Args:
+            df: One row per raw transaction, one column per RawTransaction field
+
+        Returns:
+            List of normalized, deduplicated transactions
+        """
+        if df.empty:
+            return []
+
+        raw_count = len(df)
+        dates = self._parse_dates(df["raw_date"])
+        amounts = self._clean_amounts(df["raw_amount"])
+
+        # Rows without a usable date or amount are dropped, as before
+        valid = dates.notna() & amounts.str.fullmatch(_AMOUNT_RE)
+        df = df[valid]
+        dates = dates[valid]
+        amounts = amounts[valid]
 
-        for raw in raw_transactions:
-            try:
-                txn = self._normalize_single(raw)
-                if txn and txn.id not in self._seen_hashes:
-                    self._seen_hashes.add(txn.id)
-                    normalized.append(txn)
-            except Exception as e:
-                logger.warning(
-                    f"Failed to normalize transaction at line {raw.line_number}: {e}"
+        references = self._clean_references(df["raw_reference"])
+        descriptions = df["description"].str.strip()
+
+        # Hash all rows at once and drop duplicates (within and across batches)
+        keys = self._hash_rows(dates, amounts, references, descriptions)
+        fresh = ~keys.duplicated() & ~np.isin(keys.to_numpy(), self._seen_keys)
+        self._seen_keys = np.union1d(self._seen_keys, keys[fresh].to_numpy())
+
+        normalized = []
+        for key, txn_date, amount_str, reference, description, source_file, line in zip(
+            keys[fresh].tolist(),
+            dates[fresh].dt.date.tolist(),
+            amounts[fresh].tolist(),
+            references[fresh].tolist(),
+            descriptions[fresh].tolist(),
+            df["source_file"][fresh].tolist(),
+            df["line_number"][fresh].tolist(),
+            strict=True,
+        ):
+            normalized.append(
+                NormalizedTransaction(
+                    id=f"{key:016x}",
+                    transaction_date=txn_date,
+                    amount=Decimal(amount_str),
+                    reference=reference,
+                    description=description,
+                    source=self.source.value,
+                    metadata={
+                        "source_file": source_file,
+                        "line_number": line,
+                    },
                 )
-                continue
+            )
 
         logger.info(
-            f"Normalized {len(normalized)} transactions from {len(raw_transactions)} raw"
+            "Normalized %d transactions from %d raw",
+            len(normalized),
+            raw_count,
         )
         return normalized
 
-    def _normalize_single(self, raw: RawTransaction) -> NormalizedTransaction | None:
-        """Normalize a single transaction."""
-        # Parse date
-        txn_date = self._parse_date(raw.raw_date)
-        if not txn_date:
-            return None
-
-        # Parse amount
-        amount = self._parse_amount(raw.raw_amount)
-        if amount is None:
-            return None
-
-        # Clean reference
-        reference = self._clean_reference(raw.raw_reference)
-
-        # Generate unique ID
-        txn_id = self._generate_id(txn_date, amount, reference, raw.description)
-
-        return NormalizedTransaction(
-            id=txn_id,
-            transaction_date=txn_date,
-            amount=amount,
-            reference=reference,
-            description=raw.description.strip(),
-            source=self.source.value,
-            metadata={
-                "source_file": raw.source_file,
-                "line_number": raw.line_number,
-            },
-        )
+    def _parse_dates(self, dates: pd.Series) -> pd.Series:
+        """
+        Parse various date formats; unparseable values become NaT.
 
-    def _parse_date(self, date_str: str) -> date | None:
-        """Parse various date formats into date object."""
-        try:
-            # dateutil handles most formats automatically
-            parsed = date_parser.parse(date_str, dayfirst=True)
-            return parsed.date()
-        except (ValueError, TypeError):
-            return None
-
-    def _parse_amount(self, amount_str: str) -> Decimal | None:
-        """Parse amount string to Decimal."""
+        A statement repeats the same few hundred days across its rows, so each
+        distinct string is parsed once and the results are spread back out.
+        """
+        codes, uniques = pd.factorize(dates.str.strip())
+        parsed = self._parse_unique_dates(pd.Series(uniques)).to_numpy()
+        # Code -1 marks missing values; it picks the trailing NaT
+        parsed = np.append(parsed, np.datetime64("NaT", "us"))[codes]
+        return pd.Series(parsed, index=dates.index)
+
+    def _parse_unique_dates(self, pending: pd.Series) -> pd.Series:
+        """Parse distinct date strings against the format table, then inference."""
+        parsed = pd.Series(pd.NaT, index=pending.index, dtype="datetime64[us]")
+
+        # Files are usually homogeneous: try the format that won last time first
+        formats = sorted(
+            _FAST_DATE_FORMATS, key=lambda fmt: fmt != self._preferred_date_format
+        )
+        best_hits = 0
+        for fmt in formats:
+            if pending.empty:
+                break
+            attempt = pd.to_datetime(pending, format=fmt, errors="coerce")
+            hit = attempt.notna()
+            hits = int(hit.sum())
+            if hits:
+                parsed[hit[hit].index] = attempt[hit]
+                pending = pending[~hit]
+            if hits > best_hits:
+                best_hits = hits
+                self._preferred_date_format = fmt
+
+        # Anything else (e.g. "17 January 2024") goes through full inference
+        if not pending.empty:
+            parsed[pending.index] = self._infer_dates(pending)
+        return parsed
+
+    def _infer_dates(self, pending: pd.Series) -> pd.Series:
+        """Infer dates in any format; offsets are dropped, keeping wall-clock time."""
         try:
-            # Remove currency symbols and whitespace
-            clean = amount_str.strip()
-            clean = clean.replace("$", "").replace("£", "").replace("€", "")
-            clean = clean.replace(" ", "").replace(",", "")
-
-            # Handle parentheses for negative (accounting format)
-            if clean.startswith("(") and clean.endswith(")"):
-                clean = "-" + clean[1:-1]
-
-            return Decimal(clean)
-        except (InvalidOperation, ValueError):
-            return None
-
-    def _clean_reference(self, ref: str) -> str:
+            inferred = pd.to_datetime(
+                pending, dayfirst=True, errors="coerce", format="mixed"
+            )
+        except (TypeError, ValueError):
+            # Mixed offsets, or aware next to naive values, cannot share one
+            # column: coerce row by row so one odd cell can't fail the batch
+            return pending.map(_infer_date).astype("datetime64[us]")
+        # "2024-01-15T23:30:00-05:00" is the 15th, as the statement shows it
+        if inferred.dt.tz is not None:
+            inferred = inferred.dt.tz_localize(None)
+        return inferred
+
+    def _clean_amounts(self, amounts: pd.Series) -> pd.Series:
+        """Strip currency symbols and separators from amount strings."""
+        clean = amounts.str.replace(_AMOUNT_STRIP_RE, "", regex=True)
+
+        # Handle parentheses for negative (accounting format): (500.00) -> -500.00.
+        # Two prefix/suffix checks find them; only those few rows are rewritten.
+        negative = clean.str.startswith("(", na=False)
+        negative &= clean.str.endswith(")", na=False)
+        if negative.any():
+            clean[negative] = "-" + clean[negative].str.slice(1, -1)
+        return clean
+
+    def _clean_references(self, refs: pd.Series) -> pd.Series:
         """Standardize reference format."""
-        return ref.strip().upper().replace(" ", "")
-
-    def _generate_id(
-        self, txn_date: date, amount: Decimal, reference: str, description: str
-    ) -> str:
-        """Generate unique hash ID for transaction."""
-        content = f"{txn_date.isoformat()}|{amount}|{reference}|{description}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        return refs.str.translate(_REFERENCE_WHITESPACE).str.upper()
+
+    def _hash_rows(
+        self,
+        dates: pd.Series,
+        amounts: pd.Series,
+        references: pd.Series,
+        descriptions: pd.Series,
+    ) -> pd.Series:
+        """Generate a 64-bit dedupe key per row from its identifying fields."""
+        # ISO day strings straight from datetime64, the same text str(date)
+        # gives, without a Python call per row
+        days = np.datetime_as_string(dates.to_numpy().astype("datetime64[D]"))
+        content = pd.Series(days, index=dates.index).str.cat(
+            [amounts, references, descriptions], sep="|"
+        )
+        return pd.util.hash_pandas_object(content, index=False)
@@ -1,7 +1,10 @@
 """Data quality validators."""
 
+from datetime import date
 from decimal import Decimal
 
+import numpy as np
+
 from src.logger import setup_logger
 from src.models.transaction import NormalizedTransaction
 
@@ -21,10 +24,14 @@ class DataValidator:
 
     MAX_AMOUNT = Decimal("1000000000")  # 1 billion limit
     MIN_DATE_YEAR = 2000
+    _MIN_ORDINAL = date(MIN_DATE_YEAR, 1, 1).toordinal()
+    MAX_DIAG = 50  # Errors/warnings kept for the report; the rest are counted
 
     def __init__(self):
         self.errors: list[tuple[str, str]] = []
         self.warnings: list[tuple[str, str]] = []
+        self._total_errors = 0
+        self._total_warnings = 0
 
     def validate_batch(
         self, transactions: list[NormalizedTransaction]
@@ -32,49 +39,72 @@ class DataValidator:
         """
         Validate a batch of transactions.
 
+        Amounts (in cents) and dates (as ordinals) are gathered straight into
+        NumPy arrays and each check is a boolean mask over the whole batch;
+        messages are only built for the rows that fail.
+
         Returns:
             Tuple of (valid_transactions, invalid_transactions)
         """
-        valid = []
-        invalid = []
-
-        for txn in transactions:
-            if self._validate_single(txn):
-                valid.append(txn)
-            else:
-                invalid.append(txn)
-
-        logger.info(f"Validation: {len(valid)} valid, {len(invalid)} invalid")
-        return valid, invalid
-
-    def _validate_single(self, txn: NormalizedTransaction) -> bool:
-        """Validate a single transaction."""
-        is_valid = True
-
-        # Check amount
-        if txn.amount == 0:
-            self.warnings.append((txn.id, "Zero amount transaction"))
-
-        if abs(txn.amount) > self.MAX_AMOUNT:
+        if not transactions:
+            logger.info("Validation: 0 valid, 0 invalid")
+            return [], []
+
+        n = len(transactions)
+        # float64, not int64, so no amount can overflow; boundary rows are
+        # confirmed against the exact Decimal below anyway
+        cents = np.abs(
+            np.fromiter((t.amount_cents for t in transactions), np.float64, n)
+        )
+        ordinals = np.fromiter(
+            (t.transaction_date.toordinal() for t in transactions), np.int32, n
+        )
+
+        # Cents are rounded, so confirm boundary rows against the exact amount
+        zero = cents == 0
+        zero[zero] = [transactions[i].amount == 0 for i in np.flatnonzero(zero)]
+        too_large = cents >= int(self.MAX_AMOUNT * 100)
+        too_large[too_large] = [
+            abs(transactions[i].amount) > self.MAX_AMOUNT
+            for i in np.flatnonzero(too_large)
+        ]
+        too_old = ordinals < self._MIN_ORDINAL
+        no_description = np.fromiter(
+            (not t.description.strip() for t in transactions), bool, n
+        )
+
+        self._total_warnings += int(zero.sum()) + int(no_description.sum())
+        self._total_errors += int(too_large.sum()) + int(too_old.sum())
+
+        # Only the first MAX_DIAG messages are kept, so build no more than that
+        for i in self._first_free(zero, self.warnings):
+            self.warnings.append((transactions[i].id, "Zero amount transaction"))
+        for i in self._first_free(too_large, self.errors):
+            txn = transactions[i]
             self.errors.append((txn.id, f"Amount exceeds limit: {txn.amount}"))
-            is_valid = False
-
-        # Check date
-        if txn.transaction_date.year < self.MIN_DATE_YEAR:
+        for i in self._first_free(too_old, self.errors):
+            txn = transactions[i]
             self.errors.append((txn.id, f"Date too old: {txn.transaction_date}"))
-            is_valid = False
+        for i in self._first_free(no_description, self.warnings):
+            self.warnings.append((transactions[i].id, "Empty description"))
 
-        # Check required fields
-        if not txn.description.strip():
-            self.warnings.append((txn.id, "Empty description"))
+        is_invalid = too_large | too_old
+        valid = [transactions[i] for i in np.flatnonzero(~is_invalid).tolist()]
+        invalid = [transactions[i] for i in np.flatnonzero(is_invalid).tolist()]
+
+        logger.info("Validation: %d valid, %d invalid", len(valid), len(invalid))
+        return valid, invalid
 
-        return is_valid
+    def _first_free(self, mask: np.ndarray, diagnostics: list) -> np.ndarray:
+        """Indices of flagged rows that still fit in a diagnostics list."""
+        room = max(self.MAX_DIAG - len(diagnostics), 0)
+        return np.flatnonzero(mask)[:room]
 
     def get_report(self) -> dict:
         """Get validation report."""
         return {
-            "total_errors": len(self.errors),
-            "total_warnings": len(self.warnings),
-            "errors": self.errors[:50],  # Limit to first 50
-            "warnings": self.warnings[:50],
+            "total_errors": self._total_errors,
+            "total_warnings": self._total_warnings,
+            "errors": self.errors,  # Capped at MAX_DIAG
+            "warnings": self.warnings,
         }
@@ -4,7 +4,7 @@ from .bank_csv import BankCSVParser
 from .base import BaseParser
 from .ecocash import EcocashParser
 from .factory import ParserFactory
-from .sanitizer import safe_filename, sanitize_csv_value
+from .sanitizer import safe_filename, sanitize_csv_series, sanitize_csv_value
 from .zipit import ZIPITParser
 
 __all__ = [
@@ -14,5 +14,6 @@ __all__ = [
     "EcocashParser",
     "ZIPITParser",
     "sanitize_csv_value",
+    "sanitize_csv_series",
     "safe_filename",
 ]
@@ -1,9 +1,22 @@
+import io
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 from src.models.transaction import RawTransaction
 
-from .base import BaseParser
-from .sanitizer import sanitize_csv_value
+from .base import (
+    RAW_COLUMNS,
+    BaseParser,
+    FileSource,
+    read_head,
+    rewind,
+    source_name,
+    transactions_from_frame,
+)
+from .sanitizer import sanitize_csv_series
 
 
 class BankCSVParser(BaseParser):
@@ -11,30 +24,68 @@ class BankCSVParser(BaseParser):
 
     REQUIRED_COLS = {"Date", "Amount", "Reference", "Description"}
 
-    def validate(self, file_path: str) -> bool:
+    def validate(self, source: FileSource) -> bool:
         try:
-            df = pd.read_csv(file_path, nrows=1)
+            return self.validate_bytes(read_head(source), source_name(source))
+        except OSError:
+            return False
+
+    def validate_bytes(self, head: bytes, file_name: str) -> bool:
+        try:
+            df = pd.read_csv(io.BytesIO(head), nrows=1)
             return self.REQUIRED_COLS.issubset(df.columns)
         except Exception:
             return False
 
-    def parse(self, file_path: str) -> list[RawTransaction]:
-        df = pd.read_csv(file_path)
-        transactions = []
-
-        for idx, row in df.iterrows():
-            # Sanitize inputs immediately
-            clean_desc = sanitize_csv_value(str(row.get("Description", "")))
-            clean_ref = sanitize_csv_value(str(row.get("Reference", "")))
-
-            txn = RawTransaction(
-                raw_date=str(row["Date"]),
-                raw_amount=str(row["Amount"]),
-                raw_reference=clean_ref,
-                description=clean_desc,
-                source_file=file_path.split("/")[-1],
-                line_number=idx + 2,  # Header is line 1
-            )
-            transactions.append(txn)
-
-        return transactions
+    def parse(self, source: FileSource) -> list[RawTransaction]:
+        return transactions_from_frame(self.parse_frame(source))
+
+    def parse_string(
+        self, text: str, file_name: str = "<memory>"
+    ) -> list[RawTransaction]:
+        """
+        Parse CSV content already held in memory.
+
+        Args:
+            text: File content
+            file_name: Reported as RawTransaction.source_file
+        """
+        return transactions_from_frame(
+            self._read_frame(io.BytesIO(text.encode("utf-8")), file_name)
+        )
+
+    def parse_frame(self, source: FileSource) -> pd.DataFrame:
+        return self._read_frame(rewind(source), source_name(source))
+
+    def _read_frame(self, source: FileSource, file_name: str) -> pd.DataFrame:
+        """Read CSV into a raw transaction frame, sanitizing text columns."""
+        # Multi-threaded Arrow reader; known columns stay raw strings so the
+        # normalizer sees amounts/dates exactly as written in the file
+        table = pacsv.read_csv(
+            source,
+            convert_options=pacsv.ConvertOptions(
+                column_types={col: pa.string() for col in self.REQUIRED_COLS}
+            ),
+        )
+        df = table.to_pandas()
+
+        # Whole-column conversion and sanitization instead of per-row work
+        missing = pd.Series("", index=df.index)
+        dates = [str(value) for value in df["Date"].tolist()]
+        amounts = [str(value) for value in df["Amount"].tolist()]
+        # Sanitize inputs immediately. Both columns are read as Arrow strings,
+        # which are never null: empty cells arrive as ""
+        references = sanitize_csv_series(df.get("Reference", missing).astype(str))
+        descriptions = sanitize_csv_series(df.get("Description", missing).astype(str))
+
+        return pd.DataFrame(
+            {
+                "raw_date": dates,
+                "raw_amount": amounts,
+                "raw_reference": references,
+                "description": descriptions,
+                "source_file": file_name,
+                "line_number": np.arange(2, len(df) + 2),  # Header is line 1
+            },
+            columns=RAW_COLUMNS,
+        )
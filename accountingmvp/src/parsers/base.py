@@ -1,15 +1,142 @@
+import io
+import os
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import BinaryIO, TextIO
+
+import pandas as pd
 
 from src.models.transaction import RawTransaction
 
+# A path on disk, or an in-memory binary buffer (e.g. an uploaded file wrapped
+# in io.BytesIO). Buffers may carry a ``name`` attribute used for routing and
+# for RawTransaction.source_file.
+FileSource = str | BinaryIO
+
+# Columns of a raw transaction frame, mirroring RawTransaction's fields
+RAW_COLUMNS = [
+    "raw_date",
+    "raw_amount",
+    "raw_reference",
+    "description",
+    "source_file",
+    "line_number",
+]
+
+# Bytes read from the start of a file for format detection (validate_bytes)
+HEAD_BYTES = 4096
+
+
+def source_name(source: FileSource) -> str:
+    """Return the file name of a path or named buffer."""
+    if isinstance(source, str):
+        return os.path.basename(source)
+    name = getattr(source, "name", None)
+    return os.path.basename(name) if isinstance(name, str) else "<memory>"
+
+
+def rewind(source: FileSource) -> FileSource:
+    """Seek buffers back to the start so they can be read again."""
+    if not isinstance(source, str):
+        source.seek(0)
+    return source
+
+
+def transactions_from_frame(df: pd.DataFrame) -> list[RawTransaction]:
+    """Materialize RawTransaction objects from a raw transaction frame."""
+    return [
+        RawTransaction(
+            raw_date=raw_date,
+            raw_amount=raw_amount,
+            raw_reference=raw_reference,
+            description=description,
+            source_file=source_file,
+            line_number=line_number,
+        )
+        for raw_date, raw_amount, raw_reference, description, source_file, line_number in zip(
+            *(df[col].tolist() for col in RAW_COLUMNS), strict=True
+        )
+    ]
+
+
+def read_head(source: FileSource, size: int = HEAD_BYTES) -> bytes:
+    """
+    Read the start of a path or buffer for format detection.
+
+    When the file is longer than ``size``, the head is cut back to its last
+    complete line so validators never see a truncated row. Buffers are left
+    rewound.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            head = f.read(size)
+    else:
+        head = rewind(source).read(size)
+        rewind(source)
+
+    if len(head) == size and b"\n" in head:
+        head = head[: head.rindex(b"\n") + 1]
+    return head
+
+
+def frame_from_transactions(transactions: list[RawTransaction]) -> pd.DataFrame:
+    """Build a raw transaction frame from RawTransaction objects."""
+    return pd.DataFrame(
+        {col: [getattr(t, col) for t in transactions] for col in RAW_COLUMNS},
+        columns=RAW_COLUMNS,
+    )
+
+
+@contextmanager
+def open_text(source: FileSource, errors: str = "replace") -> Iterator[TextIO]:
+    """Open a path or binary buffer as UTF-8 text."""
+    if isinstance(source, str):
+        with open(source, encoding="utf-8", errors=errors) as f:
+            yield f
+        return
+
+    rewind(source)
+    wrapper = io.TextIOWrapper(source, encoding="utf-8", errors=errors)
+    try:
+        yield wrapper
+    finally:
+        # Leave the caller's buffer open
+        wrapper.detach()
+
 
 class BaseParser(ABC):
     @abstractmethod
-    def parse(self, file_path: str) -> list[RawTransaction]:
-        """Parse file and return list of raw transactions."""
+    def parse(self, source: FileSource) -> list[RawTransaction]:
+        """Parse file or buffer and return list of raw transactions."""
         pass
 
     @abstractmethod
-    def validate(self, file_path: str) -> bool:
+    def validate(self, source: FileSource) -> bool:
         """Validate file format/headers before parsing."""
         pass
+
+    def validate_bytes(self, head: bytes, file_name: str) -> bool:
+        """
+        Validate format from the start of a file (see read_head).
+
+        Lets ParserFactory read a file once and offer the same bytes to every
+        candidate parser. Parsers override this to check ``head`` directly;
+        the default wraps it in a buffer and defers to validate().
+
+        Args:
+            head: First bytes of the file, cut back to whole lines
+            file_name: File name, for extension-based checks
+        """
+        buffer = io.BytesIO(head)
+        buffer.name = file_name
+        return self.validate(buffer)
+
+    def parse_frame(self, source: FileSource) -> pd.DataFrame:
+        """
+        Parse file or buffer into a frame with one column per RawTransaction field.
+
+        Parsers that can build columns directly override this to skip
+        constructing per-row RawTransaction objects.
+        """
+        return frame_from_transactions(self.parse(source))
@@ -1,13 +1,37 @@
 """Ecocash export parser for messy string formats."""
 
+import io
 import re
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 from src.models.transaction import RawTransaction
 
-from .base import BaseParser
-from .sanitizer import sanitize_csv_value
+from .base import (
+    RAW_COLUMNS,
+    BaseParser,
+    FileSource,
+    frame_from_transactions,
+    open_text,
+    read_head,
+    rewind,
+    source_name,
+    transactions_from_frame,
+)
+from .sanitizer import sanitize_csv_series, sanitize_csv_value
+
+
+def _combine_patterns(
+    patterns: dict[str, re.Pattern], kinds: tuple[str, ...]
+) -> re.Pattern:
+    """Join patterns into one alternation with a named group per kind."""
+    return re.compile(
+        "|".join(f"(?P<{kind}>{patterns[kind].pattern})" for kind in kinds),
+        re.IGNORECASE,
+    )
 
 
 class EcocashParser(BaseParser):
@@ -24,34 +48,51 @@ class EcocashParser(BaseParser):
     - "Transfer of $50.00 to Jane Smith completed. Ref: EC12345"
     """
 
-    # Regex patterns for Ecocash transaction extraction
+    # Regex patterns for Ecocash transaction extraction. Names start with a
+    # letter and are bounded (and absorb their trailing whitespace themselves),
+    # so crafted messages can't make the name capture backtrack at length.
+    # Possessive quantifiers (*+, ++, {m,n}+) are used wherever the next token
+    # can't match what the quantifier consumed, so giving characters back could
+    # never produce a match: the engine skips those backtracking states.
     PATTERNS = {
         "received": re.compile(
-            r"(?:received|got)\s+\$?([\d,]+(?:\.\d{2})?)\s+"
-            r"from\s+([A-Za-z\s]+)\s*"
-            r"(?:\((\d+)\))?\s*"
-            r"(?:on\s+)?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})?",
+            r"(?:received|got)\s++\$?([\d,]++(?:\.\d{2})?)\s++"
+            r"from\s++([A-Za-z][A-Za-z\s]{0,60}+)"
+            r"(?:\((\d++)\))?\s*+"
+            r"(?:on\s++)?(\d{1,2}+[/-]\d{1,2}+[/-]\d{2,4}+)?",
             re.IGNORECASE,
         ),
         "sent": re.compile(
-            r"(?:sent|transferred?|paid)\s+\$?([\d,]+(?:\.\d{2})?)\s+"
-            r"to\s+([A-Za-z\s]+)\s*"
-            r"(?:\((\d+)\))?\s*"
-            r"(?:on\s+)?(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})?",
+            r"(?:sent|transferred?|paid)\s++\$?([\d,]++(?:\.\d{2})?)\s++"
+            r"to\s++([A-Za-z][A-Za-z\s]{0,60}+)"
+            r"(?:\((\d++)\))?\s*+"
+            r"(?:on\s++)?(\d{1,2}+[/-]\d{1,2}+[/-]\d{2,4}+)?",
             re.IGNORECASE,
         ),
         "reference": re.compile(
-            r"(?:ref(?:erence)?[:\s]*|txn[:\s]*|id[:\s]*)([A-Z0-9]+)", re.IGNORECASE
+            r"(?:ref(?:erence)?[:\s]*+|txn[:\s]*+|id[:\s]*+)([A-Z0-9]++)",
+            re.IGNORECASE,
         ),
-        "amount": re.compile(r"\$?([\d,]+(?:\.\d{2})?)"),
-        "date": re.compile(r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})"),
+        "amount": re.compile(r"\$?([\d,]++(?:\.\d{2})?)"),
+        "date": re.compile(r"(\d{1,2}+[/-]\d{1,2}+[/-]\d{2,4}+)"),
     }
 
+    # All of the above as one alternation, so a line is scanned once. At a
+    # given position earlier branches win: a date or reference is not read as
+    # an amount. The reference itself is searched separately (see
+    # _extract_transaction_from_text).
+    TEXT_PATTERN = _combine_patterns(
+        PATTERNS, ("received", "sent", "reference", "date", "amount")
+    )
+
     # Expected CSV columns for structured Ecocash exports
     EXPECTED_COLS = {"date", "amount", "description"}
     ALTERNATE_COLS = {"transaction_date", "value", "details"}
 
-    def validate(self, file_path: str) -> bool:
+    # Lowercase keywords that mark a text file as an Ecocash export
+    KEYWORDS = (b"ecocash", b"econet", b"received", b"transferred")
+
+    def validate(self, source: FileSource) -> bool:
         """
         Validate if file is an Ecocash export.
 
@@ -59,49 +100,58 @@ class EcocashParser(BaseParser):
         - CSV with expected columns
         - Text file with Ecocash transaction patterns
         """
+        try:
+            return self.validate_bytes(read_head(source), source_name(source))
+        except OSError:
+            return False
+
+    def validate_bytes(self, head: bytes, file_name: str) -> bool:
         try:
             # Try CSV validation first
-            if file_path.endswith(".csv"):
-                df = pd.read_csv(file_path, nrows=5)
+            if file_name.endswith(".csv"):
+                df = pd.read_csv(io.BytesIO(head), nrows=5)
                 cols_lower = {c.lower() for c in df.columns}
                 if self.EXPECTED_COLS.issubset(cols_lower):
                     return True
                 if self.ALTERNATE_COLS.issubset(cols_lower):
                     return True
 
-            # Try text-based validation
-            with open(file_path, encoding="utf-8", errors="replace") as f:
-                content = f.read(2000)  # Read first 2KB
-                # Look for Ecocash patterns
-                if any(
-                    pattern in content.lower()
-                    for pattern in ["ecocash", "econet", "received", "transferred"]
-                ):
-                    return True
-
-            return False
+            # Try text-based validation on the raw bytes: ASCII keywords can't
+            # occur inside UTF-8 multi-byte sequences, so no decode is needed
+            content = head[:2000].lower()  # First 2KB
+            return any(keyword in content for keyword in self.KEYWORDS)
         except Exception:
             return False
 
-    def parse(self, file_path: str) -> list[RawTransaction]:
+    def parse(self, source: FileSource) -> list[RawTransaction]:
         """
         Parse Ecocash export file.
 
         Handles both structured CSV and unstructured text formats.
         """
         # Try structured CSV first
-        if file_path.endswith(".csv"):
+        if source_name(source).endswith(".csv"):
             try:
-                return self._parse_csv(file_path)
+                return transactions_from_frame(self._parse_csv(source))
             except Exception:
                 pass
 
         # Fall back to text parsing
-        return self._parse_text(file_path)
+        return self._parse_text(source)
 
-    def _parse_csv(self, file_path: str) -> list[RawTransaction]:
-        """Parse structured Ecocash CSV export."""
-        df = pd.read_csv(file_path)
+    def parse_frame(self, source: FileSource) -> pd.DataFrame:
+        """Parse Ecocash export file into a raw transaction frame."""
+        if source_name(source).endswith(".csv"):
+            try:
+                return self._parse_csv(source)
+            except Exception:
+                pass
+
+        return frame_from_transactions(self._parse_text(source))
+
+    def _parse_csv(self, source: FileSource) -> pd.DataFrame:
+        """Parse structured Ecocash CSV export into a raw transaction frame."""
+        df = self._read_csv(source)
 
         # Normalize column names
         df.columns = df.columns.str.lower().str.strip()
@@ -116,52 +166,81 @@ class EcocashParser(BaseParser):
         }
         df = df.rename(columns=col_mapping)
 
-        transactions = []
-        for idx, row in df.iterrows():
-            # Extract fields with fallbacks
-            date_val = str(row.get("date", ""))
-            amount_val = str(row.get("amount", "0"))
-            desc_val = str(row.get("description", ""))
-            ref_val = str(row.get("reference", row.get("ref", "")))
-
-            # Try to extract reference from description if not present
-            if not ref_val:
-                ref_match = self.PATTERNS["reference"].search(desc_val)
-                if ref_match:
-                    ref_val = ref_match.group(1)
-
-            txn = RawTransaction(
-                raw_date=date_val,
-                raw_amount=amount_val.replace(",", ""),
-                raw_reference=sanitize_csv_value(ref_val),
-                description=sanitize_csv_value(desc_val),
-                source_file=file_path.split("/")[-1],
-                line_number=idx + 2,
+        # Whole-column string ops instead of a Python loop over rows
+        def text(*names: str, default: str = "") -> pd.Series:
+            for name in names:
+                if name in df.columns:
+                    return df[name].astype(str)
+            return pd.Series(default, index=df.index, dtype=str)
+
+        dates = text("date")
+        amounts = text("amount", default="0").str.replace(",", "", regex=False)
+        descriptions = text("description")
+        references = text("reference", "ref")
+
+        # Try to extract reference from description if not present
+        blank = references == ""
+        if blank.any():
+            extracted = descriptions[blank].str.extract(
+                self.PATTERNS["reference"], expand=False
             )
-            transactions.append(txn)
+            references[blank] = extracted.fillna("")
+
+        return pd.DataFrame(
+            {
+                "raw_date": dates,
+                "raw_amount": amounts,
+                "raw_reference": sanitize_csv_series(references),
+                "description": sanitize_csv_series(descriptions),
+                "source_file": source_name(source),
+                "line_number": np.arange(2, len(df) + 2),  # Header is line 1
+            },
+            columns=RAW_COLUMNS,
+        )
+
+    def _read_csv(self, source: FileSource) -> pd.DataFrame:
+        """
+        Read a CSV export with every column kept as the raw strings written.
 
-        return transactions
+        Uses Arrow's multi-threaded reader, like BankCSVParser; empty cells
+        stay "" rather than becoming NaN, and amounts keep their formatting.
+        """
+        try:
+            # Column names come from the first block; every column stays text.
+            # Close the streaming reader so a path source's handle is released.
+            with pacsv.open_csv(rewind(source)) as reader:
+                names = reader.schema.names
+            table = pacsv.read_csv(
+                rewind(source),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={name: pa.string() for name in names}
+                ),
+            )
+            return table.to_pandas()
+        except pa.ArrowInvalid:
+            # e.g. short rows, which pandas pads and Arrow rejects
+            return pd.read_csv(rewind(source), dtype=str, keep_default_na=False)
 
-    def _parse_text(self, file_path: str) -> list[RawTransaction]:
+    def _parse_text(self, source: FileSource) -> list[RawTransaction]:
         """Parse unstructured Ecocash text export (SMS logs, etc.)."""
         transactions = []
+        file_name = source_name(source)
 
-        with open(file_path, encoding="utf-8", errors="replace") as f:
-            lines = f.readlines()
-
-        for line_num, line in enumerate(lines, start=1):
-            line = line.strip()
-            if not line:
-                continue
+        # Stream lines rather than holding a readlines() copy of the file
+        with open_text(source) as f:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
 
-            txn = self._extract_transaction_from_text(line, file_path, line_num)
-            if txn:
-                transactions.append(txn)
+                txn = self._extract_transaction_from_text(line, file_name, line_num)
+                if txn:
+                    transactions.append(txn)
 
         return transactions
 
     def _extract_transaction_from_text(
-        self, text: str, file_path: str, line_num: int
+        self, text: str, file_name: str, line_num: int
     ) -> RawTransaction | None:
         """Extract transaction details from a text line."""
         amount = None
@@ -169,37 +248,40 @@ class EcocashParser(BaseParser):
         description = text[:100]  # Use first 100 chars as description
         reference = ""
 
-        # Try to match received pattern
-        match = self.PATTERNS["received"].search(text)
-        if match:
-            amount = match.group(1)
-            description = f"Received from {match.group(2).strip()}"
-            date = match.group(4) if match.group(4) else ""
-
-        # Try to match sent pattern
-        if not amount:
-            match = self.PATTERNS["sent"].search(text)
-            if match:
-                amount = f"-{match.group(1)}"  # Negative for outgoing
-                description = f"Sent to {match.group(2).strip()}"
-                date = match.group(4) if match.group(4) else ""
-
-        # Extract reference
+        # Single pass: keep the first match of each kind, as its inner groups
+        found: dict[str, tuple] = {}
+        groups_after = self.TEXT_PATTERN.groupindex
+        for match in self.TEXT_PATTERN.finditer(text):
+            kind = match.lastgroup
+            if kind not in found:
+                found[kind] = match.groups()[groups_after[kind] :]
+
+        # Received takes precedence over sent
+        if "received" in found:
+            groups = found["received"]
+            amount = groups[0]
+            description = f"Received from {groups[1].strip()}"
+            date = groups[3] if groups[3] else ""
+        elif "sent" in found:
+            groups = found["sent"]
+            amount = f"-{groups[0]}"  # Negative for outgoing
+            description = f"Sent to {groups[1].strip()}"
+            date = groups[3] if groups[3] else ""
+
+        # Searched on its own: the sent/received name group can swallow a
+        # following "Ref"/"Txn"/"ID" keyword ("to Bob Ref: X1"), hiding it
+        # from the single scan above
         ref_match = self.PATTERNS["reference"].search(text)
         if ref_match:
             reference = ref_match.group(1)
 
-        # If no amount found, try generic extraction
-        if not amount:
-            amount_match = self.PATTERNS["amount"].search(text)
-            if amount_match:
-                amount = amount_match.group(1)
+        # If no amount found, fall back to the first bare amount
+        if not amount and "amount" in found:
+            amount = found["amount"][0]
 
         # Try to find date if not found
-        if not date:
-            date_match = self.PATTERNS["date"].search(text)
-            if date_match:
-                date = date_match.group(1)
+        if not date and "date" in found:
+            date = found["date"][0]
 
         # Only create transaction if we have amount
         if amount:
@@ -208,7 +290,7 @@ class EcocashParser(BaseParser):
                 raw_amount=amount.replace(",", ""),
                 raw_reference=sanitize_csv_value(reference),
                 description=sanitize_csv_value(description),
-                source_file=file_path.split("/")[-1],
+                source_file=file_name,
                 line_number=line_num,
             )
 
@@ -1,11 +1,20 @@
 """Parser factory for automatic format detection."""
 
+import os
+from functools import lru_cache
+
 from .bank_csv import BankCSVParser
-from .base import BaseParser
+from .base import BaseParser, FileSource, read_head, source_name
 from .ecocash import EcocashParser
 from .zipit import ZIPITParser
 
 
+@lru_cache(maxsize=8)
+def _parser_instance(parser_class: type[BaseParser]) -> BaseParser:
+    """Shared instance per parser class; parsers hold no per-file state."""
+    return parser_class()
+
+
 class ParserFactory:
     """
     Factory for creating appropriate parser based on file format.
@@ -20,22 +29,39 @@ class ParserFactory:
         ZIPITParser,
     ]
 
+    # Parsers that usually own an extension; tried before the rest, in
+    # PARSERS order, so a mislabeled file is still detected
+    EXTENSION_PARSERS: dict[str, list[type[BaseParser]]] = {
+        ".csv": [BankCSVParser, EcocashParser],
+        ".txt": [EcocashParser, ZIPITParser],
+    }
+
     @classmethod
-    def get_parser(cls, file_path: str) -> BaseParser | None:
+    def get_parser(cls, source: FileSource) -> BaseParser | None:
         """
         Detect file format and return appropriate parser.
 
         Args:
-            file_path: Path to the file to parse
+            source: Path to the file, or a binary buffer (optionally with a
+                ``name`` attribute used for extension-based checks)
 
         Returns:
             Parser instance or None if format not recognized
         """
-        # Try each parser's validation
-        for parser_class in cls.PARSERS:
-            parser = parser_class()
+        try:
+            # Read the file once and let every candidate validate those bytes
+            head = read_head(source)
+        except OSError:
+            return None
+
+        file_name = source_name(source)
+        likely = cls.EXTENSION_PARSERS.get(os.path.splitext(file_name)[1].lower(), [])
+        others = [p for p in cls.PARSERS if p not in likely]
+
+        for parser_class in likely + others:
+            parser = _parser_instance(parser_class)
             try:
-                if parser.validate(file_path):
+                if parser.validate_bytes(head, file_name):
                     return parser
             except Exception:
                 continue
@@ -61,5 +87,5 @@ class ParserFactory:
 
         parser_class = type_map.get(parser_type.lower())
         if parser_class:
-            return parser_class()
+            return _parser_instance(parser_class)
         return None
@@ -2,6 +2,17 @@
 
 import re
 
+import pandas as pd
+
+# Dangerous prefixes that trigger formula execution
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# safe_filename patterns, compiled once
+_TRAVERSAL_RE = re.compile(r"\.\.[\\/]")
+_LEADING_SLASH_RE = re.compile(r"^[\\/]+")
+_SPECIAL_CHARS_RE = re.compile(r"[^a-zA-Z0-9_.-]")
+_UNDERSCORES_RE = re.compile(r"_+")
+
 
 def sanitize_csv_value(value: str) -> str:
     """
@@ -11,18 +22,25 @@ def sanitize_csv_value(value: str) -> str:
     if not value:
         return ""
 
-    # Dangerous prefixes that trigger formula execution
-    dangerous_prefixes = ("=", "+", "-", "@", "\t", "\r")
-
     clean_value = value.strip()
 
-    if clean_value.startswith(dangerous_prefixes):
+    if clean_value.startswith(_FORMULA_PREFIXES):
         # Prefix with single quote to force text interpretation
         return f"'{clean_value}"
 
     return clean_value
 
 
+def sanitize_csv_series(values: pd.Series) -> pd.Series:
+    """
+    Column-wise sanitize_csv_value: one vectorized pass over a whole Series.
+
+    Missing values become empty strings.
+    """
+    clean = values.fillna("").astype(str).str.strip()
+    return clean.mask(clean.str.startswith(_FORMULA_PREFIXES), "'" + clean)
+
+
 def safe_filename(filename: str) -> str:
     """
     Removes path traversal and other dangerous characters from filenames.
@@ -37,16 +55,16 @@ def safe_filename(filename: str) -> str:
     clean = filename
 
     # Remove ../ and ..\\ sequences
-    clean = re.sub(r"\.\.[\\/]", "", clean)
+    clean = _TRAVERSAL_RE.sub("", clean)
 
     # Remove leading slashes (absolute paths)
-    clean = re.sub(r"^[\\/]+", "", clean)
+    clean = _LEADING_SLASH_RE.sub("", clean)
 
     # Replace remaining special characters with underscores
-    clean = re.sub(r"[^a-zA-Z0-9_.-]", "_", clean)
+    clean = _SPECIAL_CHARS_RE.sub("_", clean)
 
     # Collapse multiple underscores
-    clean = re.sub(r"_+", "_", clean)
+    clean = _UNDERSCORES_RE.sub("_", clean)
 
     # Remove leading/trailing underscores
     clean = clean.strip("_")
@@ -1,11 +1,22 @@
 """ZIPIT text file parser."""
 
+import io
 import re
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
 
 from src.models.transaction import RawTransaction
 
-from .base import BaseParser
-from .sanitizer import sanitize_csv_value
+from .base import (
+    RAW_COLUMNS,
+    BaseParser,
+    FileSource,
+    open_text,
+    read_head,
+    source_name,
+)
+from .sanitizer import sanitize_csv_series, sanitize_csv_value
 
 
 class ZIPITParser(BaseParser):
@@ -16,53 +27,106 @@ class ZIPITParser(BaseParser):
     DATE | REFERENCE | AMOUNT | DESCRIPTION
     """
 
-    # Regex pattern for ZIPIT line format
+    # Regex pattern for ZIPIT line format. Dates and amounts are ASCII
+    # digits ([0-9] skips the Unicode digit tables \d consults); separators
+    # keep Unicode \s so exports padded with non-breaking spaces still match.
     LINE_PATTERN = re.compile(
-        r"^(\d{2}[/-]\d{2}[/-]\d{4})\s*\|\s*([A-Z0-9]+)\s*\|\s*([\d,.-]+)\s*\|\s*(.+)$"
+        r"^([0-9]{2}[/-][0-9]{2}[/-][0-9]{4})\s*\|\s*([A-Z0-9]+)\s*\|"
+        r"\s*([0-9,.-]+)\s*\|\s*(.+)$"
     )
 
-    def validate(self, file_path: str) -> bool:
+    def validate(self, source: FileSource) -> bool:
         """Check if file matches ZIPIT format."""
         try:
-            with open(file_path, encoding="utf-8") as f:
-                # Check first few non-empty lines
-                valid_lines = 0
-                for i, line in enumerate(f):
-                    if i > 10:
-                        break
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if self.LINE_PATTERN.match(line):
-                        valid_lines += 1
-                return valid_lines >= 2
-        except Exception:
+            return self.validate_bytes(read_head(source), source_name(source))
+        except OSError:
+            return False
+
+    def validate_bytes(self, head: bytes, file_name: str) -> bool:
+        try:
+            # newline=None: universal newlines, as when reading the file as text
+            lines = io.StringIO(head.decode("utf-8"), newline=None)
+        except UnicodeDecodeError:
             return False
 
-    def parse(self, file_path: str) -> list[RawTransaction]:
+        # Check first few non-empty lines
+        valid_lines = 0
+        for i, line in enumerate(lines):
+            if i > 10:
+                break
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if self.LINE_PATTERN.match(line):
+                valid_lines += 1
+        return valid_lines >= 2
+
+    def parse(self, source: FileSource) -> list[RawTransaction]:
         """Parse ZIPIT text file into raw transactions."""
-        transactions = []
-
-        with open(file_path, encoding="utf-8", errors="replace") as f:
-            for line_num, line in enumerate(f, start=1):
-                line = line.strip()
-
-                # Skip empty lines and comments
-                if not line or line.startswith("#"):
-                    continue
-
-                match = self.LINE_PATTERN.match(line)
-                if match:
-                    date_str, ref, amount, desc = match.groups()
-
-                    txn = RawTransaction(
-                        raw_date=date_str,
-                        raw_amount=amount.replace(",", ""),
-                        raw_reference=sanitize_csv_value(ref),
-                        description=sanitize_csv_value(desc),
-                        source_file=file_path.split("/")[-1],
-                        line_number=line_num,
-                    )
-                    transactions.append(txn)
-
-        return transactions
+        with open_text(source) as f:
+            return self._parse_lines(f, source_name(source))
+
+    def parse_text(
+        self, text: str, file_name: str = "<memory>"
+    ) -> list[RawTransaction]:
+        """
+        Parse ZIPIT content already held in memory.
+
+        Args:
+            text: File content
+            file_name: Reported as RawTransaction.source_file
+        """
+        # newline=None: universal newlines, as when reading the file as text
+        return self._parse_lines(io.StringIO(text, newline=None), file_name)
+
+    def parse_frame(self, source: FileSource) -> pd.DataFrame:
+        """Parse ZIPIT text file into a raw transaction frame."""
+        with open_text(source) as f:
+            rows = list(self._iter_fields(f))
+        df = pd.DataFrame(
+            rows,
+            columns=[
+                "raw_date",
+                "raw_reference",
+                "raw_amount",
+                "description",
+                "line_number",
+            ],
+        )
+        # Cleanup is columnar here rather than per line
+        df["raw_amount"] = df["raw_amount"].str.replace(",", "", regex=False)
+        df["raw_reference"] = sanitize_csv_series(df["raw_reference"])
+        df["description"] = sanitize_csv_series(df["description"])
+        df["source_file"] = source_name(source)
+        return df[RAW_COLUMNS]
+
+    def _parse_lines(
+        self, lines: Iterable[str], file_name: str
+    ) -> list[RawTransaction]:
+        """Build raw transactions from the lines of a ZIPIT file."""
+        return [
+            RawTransaction(
+                raw_date=date_str,
+                raw_amount=amount.replace(",", ""),
+                raw_reference=sanitize_csv_value(ref),
+                description=sanitize_csv_value(desc),
+                source_file=file_name,
+                line_number=line_num,
+            )
+            for date_str, ref, amount, desc, line_num in self._iter_fields(lines)
+        ]
+
+    def _iter_fields(
+        self, lines: Iterable[str]
+    ) -> Iterator[tuple[str, str, str, str, int]]:
+        """Stream (date, reference, amount, description, line number) per line."""
+        for line_num, line in enumerate(lines, start=1):
+            line = line.strip()
+
+            # Skip empty lines and comments
+            if not line or line.startswith("#"):
+                continue
+
+            match = self.LINE_PATTERN.match(line)
+            if match:
+                yield (*match.groups(), line_num)
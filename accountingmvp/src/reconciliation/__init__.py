@@ -1,12 +1,13 @@
 """Reconciliation package."""
 
-from .engine import ReconciliationEngine
+from .engine import ReconciliationEngine, TextScoreCache
 from .matchers import AmountMatcher, DateMatcher, FuzzyTextMatcher
 from .reporter import ReportGenerator
 from .scorer import ConfidenceScorer
 
 __all__ = [
     "ReconciliationEngine",
+    "TextScoreCache",
     "ConfidenceScorer",
     "ReportGenerator",
     "FuzzyTextMatcher",
@@ -1,14 +1,197 @@
 """Main reconciliation engine."""
 
+import math
+import multiprocessing
+import os
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+import numpy as np
+
 from src.logger import setup_logger
 from src.models.enums import MatchStatus
-from src.models.match import MatchResult, ReconciliationSummary
+from src.models.match import MatchResult, MatchScore, ReconciliationSummary
 from src.models.transaction import NormalizedTransaction
 
+from .matchers import AmountMatcher, DateMatcher
 from .scorer import ConfidenceScorer
 
 logger = setup_logger(__name__)
 
+# Best total a pair can reach when both its amount and date scores are zero
+_TEXT_ONLY_CEILING = MatchScore(
+    amount_score=0.0, text_score=1.0, date_score=0.0, reference_bonus=0.1
+).total_score
+
+# Below this many source x target pairs, process start-up costs more than it saves
+_PARALLEL_MIN_PAIRS = 10_000
+
+# Per chunk of sources, as returned by _score_chunk workers: the number of
+# kept candidates per source, their target positions, and one row of
+# (amount, text, date, reference bonus) per candidate. Plain arrays pickle
+# as flat buffers, so sending results back costs far less than MatchScores.
+_ScoredChunk = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+# Most candidate pairs scored in one vectorized block; bounds memory when
+# pruning is off and every source meets every target
+_BLOCK_PAIRS = 1 << 20
+
+# Pairs a TextScoreCache keeps by default. An entry (key tuple, float and
+# LRU links; the ids belong to the transactions) costs ~200 bytes, so a full
+# cache stays around 50 MB.
+_TEXT_CACHE_SIZE = 250_000
+
+# Engine, sources, targets and index for _score_chunk; set only while
+# a pool is running and inherited by forked workers instead of being pickled
+_WORKER_STATE: tuple | None = None
+
+
+def _concat_chunks(chunks: list[_ScoredChunk]) -> _ScoredChunk:
+    """Join consecutive _ScoredChunks into one."""
+    if len(chunks) == 1:
+        return chunks[0]
+    counts, positions, components = zip(*chunks, strict=True)
+    return (
+        np.concatenate(counts),
+        np.concatenate(positions),
+        np.concatenate(components),
+    )
+
+
+def _score_chunk(bounds: tuple[int, int]) -> _ScoredChunk:
+    """Score a slice of sources against all their candidates (pool worker)."""
+    engine, sources, targets, index = _WORKER_STATE
+    return engine._score_sources(sources[bounds[0] : bounds[1]], targets, index)
+
+
+class _CandidateIndex:
+    """
+    Struct-of-arrays view of the targets for candidate lookup and scoring.
+
+    A pair whose amount and date scores are both zero cannot reach
+    _TEXT_ONLY_CEILING, so the only targets worth scoring are those in the
+    source's date window or amount window. Targets are sorted once by amount
+    and by date so each window is found with a binary search; the arrays in
+    target order feed the vectorized amount and date scorers. Positions are
+    also labelled with an integer id per reference key, so exact-reference
+    bonuses are integer comparisons rather than string comparisons.
+    """
+
+    def __init__(
+        self,
+        targets: list[NormalizedTransaction],
+        amount_matcher: AmountMatcher,
+        date_matcher: DateMatcher,
+    ):
+        self.amount_matcher = amount_matcher
+        self.date_matcher = date_matcher
+        # Integer cents keep Decimal (and float rounding) out of the n x m work
+        self.amounts = np.array([abs(t.amount_cents) for t in targets], dtype=np.int64)
+        self.days = np.array(
+            [t.transaction_date.toordinal() for t in targets], dtype=np.int64
+        )
+        self._by_amount = np.argsort(self.amounts, kind="stable")
+        self._by_day = np.argsort(self.days, kind="stable")
+
+        # Each distinct reference key gets an integer id; -1 means no key
+        self._ref_id_by_key: dict[str, int] = {}
+        self.ref_ids = np.array(
+            [
+                (
+                    self._ref_id_by_key.setdefault(
+                        t.reference_key, len(self._ref_id_by_key)
+                    )
+                    if t.reference_key
+                    else -1
+                )
+                for t in targets
+            ],
+            dtype=np.int64,
+        )
+
+    def reference_ids(self, sources: list[NormalizedTransaction]) -> np.ndarray:
+        """Reference key ids of sources; -2 where no target shares the key."""
+        return np.array(
+            [self._ref_id_by_key.get(s.reference_key, -2) for s in sources],
+            dtype=np.int64,
+        )
+
+    def candidates(self, sources: list[NormalizedTransaction]) -> Iterator[np.ndarray]:
+        """Yield, per source, positions of targets that may score above zero."""
+        if not sources:
+            return
+
+        bounds = np.array(
+            [self.amount_matcher.get_amount_range(s) for s in sources],
+            dtype=np.float64,
+        )
+        days = np.array(
+            [s.transaction_date.toordinal() for s in sources], dtype=np.int64
+        )
+        window = self.date_matcher.window_days
+
+        sorted_amounts = self.amounts[self._by_amount]
+        amount_lo = np.searchsorted(sorted_amounts, bounds[:, 0], side="left")
+        amount_hi = np.searchsorted(sorted_amounts, bounds[:, 1], side="right")
+        sorted_days = self.days[self._by_day]
+        day_lo = np.searchsorted(sorted_days, days - window, side="left")
+        day_hi = np.searchsorted(sorted_days, days + window, side="right")
+
+        for a_lo, a_hi, d_lo, d_hi in zip(
+            amount_lo.tolist(),
+            amount_hi.tolist(),
+            day_lo.tolist(),
+            day_hi.tolist(),
+            strict=True,
+        ):
+            # union1d returns sorted positions, i.e. original target order
+            yield np.union1d(self._by_amount[a_lo:a_hi], self._by_day[d_lo:d_hi])
+
+
+class TextScoreCache:
+    """
+    Text similarity per (source id, target id), least recently used evicted.
+
+    Kept across runs so re-reconciling the same inputs (e.g. with new
+    thresholds) skips fuzzy text matching; bounded so a long-lived cache
+    doesn't grow with every pair ever scored.
+    """
+
+    def __init__(self, maxsize: int = _TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._scores: OrderedDict[tuple[str, str], float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        return iter(self._scores)
+
+    def get_many(self, keys: list[tuple[str, str]]) -> np.ndarray:
+        """Cached scores for ``keys``, NaN where missing; hits become recent."""
+        scores = self._scores
+        found = np.full(len(keys), np.nan)
+        for i, key in enumerate(keys):
+            score = scores.get(key)
+            if score is not None:
+                scores.move_to_end(key)
+                found[i] = score
+        return found
+
+    def update(self, items: Iterable[tuple[tuple[str, str], float]]) -> None:
+        """Store scores, evicting the least recently used past ``maxsize``."""
+        scores = self._scores
+        for key, score in items:
+            scores[key] = score
+            scores.move_to_end(key)
+        while len(scores) > self.maxsize:
+            scores.popitem(last=False)
+
+    def clear(self) -> None:
+        self._scores.clear()
+
 
 class ReconciliationEngine:
     """
@@ -16,13 +199,19 @@ class ReconciliationEngine:
 
     Multi-stage matching approach:
     1. Stage 1: Exact reference match (O(n))
-    2. Stage 2: Amount + Date window filter (O(n log n))
-    3. Stage 3: Fuzzy text matching on candidates (O(n²) worst case)
+    2. Stage 2: Amount / date window candidate lookup (O(n log m))
+    3. Stage 3: Fuzzy text matching on candidates (O(n²) worst case), then
+       greedy assignment of the best-scoring pairs first
     4. Stage 4: Manual review queue for low confidence
     """
 
     def __init__(
-        self, confidence_threshold: float = 0.85, manual_review_threshold: float = 0.50
+        self,
+        confidence_threshold: float = 0.85,
+        manual_review_threshold: float = 0.50,
+        n_jobs: int = 1,
+        text_cache: TextScoreCache | None = None,
+        date_window_days: int = 3,
     ):
         """
         Initialize engine.
@@ -30,10 +219,28 @@ class ReconciliationEngine:
         Args:
             confidence_threshold: Minimum score for auto-match
             manual_review_threshold: Minimum score to consider for manual review
+            n_jobs: Worker processes for fuzzy matching (-1 = one per CPU).
+                Parallel scoring needs the "fork" start method; elsewhere, and
+                for small inputs, matching runs in-process.
+            text_cache: Text similarity per (source id, target id), kept
+                across runs so re-reconciling (e.g. with new thresholds) skips
+                fuzzy text matching. Pass the same cache to several engines
+                to share it; transaction ids must identify their content, as
+                pipeline-generated ids do.
+            date_window_days: Days apart a pair's dates may be and still
+                score. Candidates are looked up within this window and the
+                amount tolerance window, so wider windows mean more pairs
+                to score.
         """
         self.confidence_threshold = confidence_threshold
         self.manual_review_threshold = manual_review_threshold
-        self.scorer = ConfidenceScorer()
+        self.n_jobs = n_jobs
+        self._text_cache = TextScoreCache() if text_cache is None else text_cache
+        self.scorer = ConfidenceScorer(date_window_days=date_window_days)
+
+    def clear_cache(self) -> None:
+        """Forget cached text scores, e.g. before reconciling unrelated data."""
+        self._text_cache.clear()
 
     def reconcile(
         self,
@@ -51,8 +258,9 @@ class ReconciliationEngine:
             Tuple of (match_results, summary)
         """
         logger.info(
-            f"Starting reconciliation: {len(source_transactions)} source, "
-            f"{len(target_transactions)} target transactions"
+            "Starting reconciliation: %d source, %d target transactions",
+            len(source_transactions),
+            len(target_transactions),
         )
 
         matches: list[MatchResult] = []
@@ -60,9 +268,6 @@ class ReconciliationEngine:
         matched_target_ids: set = set()
         manual_review_count = 0
 
-        # Build lookup index for targets
-        {t.id: t for t in target_transactions}
-
         # Stage 1: Exact reference matching
         exact_matches, matched_source_ids, matched_target_ids = (
             self._stage1_exact_match(source_transactions, target_transactions)
@@ -98,7 +303,7 @@ class ReconciliationEngine:
             manual_review_count,
         )
 
-        logger.info(f"Reconciliation complete: {summary.matched_count} matches found")
+        logger.info("Reconciliation complete: %d matches found", summary.matched_count)
         return matches, summary
 
     def _stage1_exact_match(
@@ -109,73 +314,299 @@ class ReconciliationEngine:
         matched_source_ids = set()
         matched_target_ids = set()
 
-        # Build reference index
-        target_by_ref = {}
-        for t in targets:
-            if t.reference:
-                target_by_ref[t.reference.upper()] = t
-
-        for source in sources:
-            if not source.reference:
-                continue
+        # Build reference index (the last target wins a duplicated reference)
+        target_by_ref = {t.reference_key: t for t in targets if t.reference_key}
+        source_refs = [(s, s.reference_key) for s in sources if s.reference_key]
 
-            ref = source.reference.upper()
-            if ref in target_by_ref:
-                target = target_by_ref[ref]
-
-                # Verify amount matches too
-                score = self.scorer.calculate_score(source, target)
-                if score.amount_score >= 0.95:
-                    match = MatchResult(
-                        source_transaction=source,
-                        target_transaction=target,
-                        score=score,
-                        status=MatchStatus.MATCHED,
-                        matched_by="exact_reference",
-                    )
-                    matches.append(match)
-                    matched_source_ids.add(source.id)
-                    matched_target_ids.add(target.id)
+        # One C-level set intersection finds the references worth checking
+        shared = target_by_ref.keys() & {ref for _, ref in source_refs}
 
-        logger.info(f"Stage 1 (exact): {len(matches)} matches")
+        # Sources in arrival order, so results don't depend on set ordering
+        for source, ref in source_refs:
+            if ref not in shared:
+                continue
+            target = target_by_ref[ref]
+            if target.id in matched_target_ids:
+                continue  # Already claimed by an earlier source with this ref
+
+            # Verify amount matches too; the references are already known equal
+            score = self.scorer.calculate_score(
+                source, target, reference_bonus=self.scorer.WEIGHT_REF_BONUS
+            )
+            if score.amount_score >= 0.95:
+                match = MatchResult(
+                    source_transaction=source,
+                    target_transaction=target,
+                    score=score,
+                    status=MatchStatus.MATCHED,
+                    matched_by="exact_reference",
+                )
+                matches.append(match)
+                matched_source_ids.add(source.id)
+                matched_target_ids.add(target.id)
+
+        logger.info("Stage 1 (exact): %d matches", len(matches))
         return matches, matched_source_ids, matched_target_ids
 
     def _stage23_fuzzy_match(
         self, sources: list[NormalizedTransaction], targets: list[NormalizedTransaction]
     ) -> list[MatchResult]:
         """Fuzzy matching for remaining transactions."""
-        matches = []
-        used_targets = set()
-
-        for source in sources:
-            best_match: MatchResult | None = None
-            best_score = 0.0
-
-            for target in targets:
-                if target.id in used_targets:
-                    continue
-
-                score = self.scorer.calculate_score(source, target)
-                total = score.total_score
-
-                if total > best_score and total >= self.manual_review_threshold:
-                    best_score = total
-                    best_match = MatchResult(
-                        source_transaction=source,
-                        target_transaction=target,
-                        score=score,
-                        status=MatchStatus.UNMATCHED,
-                        matched_by="fuzzy",
-                    )
 
-            if best_match:
-                matches.append(best_match)
-                if best_match.score.total_score >= self.confidence_threshold:
-                    used_targets.add(best_match.target_transaction.id)
+        index = _CandidateIndex(
+            targets, self.scorer.amount_matcher, self.scorer.date_matcher
+        )
 
-        logger.info(f"Stage 2/3 (fuzzy): {len(matches)} potential matches")
+        workers = self._worker_count(len(sources), len(targets))
+        if workers > 1:
+            chunks = self._score_parallel(sources, targets, index, workers)
+        else:
+            chunks = [self._score_sources(sources, targets, index)]
+        counts, positions, components = _concat_chunks(chunks)
+        src_positions = np.repeat(np.arange(len(sources)), counts)
+
+        # Totals for every kept pair in one expression; the same float
+        # operations as MatchScore.total_score, so the ordering is identical
+        totals = MatchScore.weighted_total(*components.T)
+
+        # Every candidate pair that reached the review threshold, best first;
+        # ties go to the earlier source, then the earlier target
+        order = np.lexsort((positions, src_positions, -totals))
+
+        # Greedy assignment, highest score first: each source takes its best
+        # pair whose target hasn't been consumed by a confident match
+        assigned: dict[int, int] = {}
+        used = np.zeros(len(targets), dtype=bool)
+        confident = (totals >= self.confidence_threshold).tolist()
+        src_list = src_positions.tolist()
+        tgt_list = positions.tolist()
+        for pair in order.tolist():
+            src_pos = src_list[pair]
+            tgt_pos = tgt_list[pair]
+            if src_pos in assigned or used[tgt_pos]:
+                continue
+            assigned[src_pos] = pair
+            if confident[pair]:
+                used[tgt_pos] = True
+            if len(assigned) == len(sources):
+                break
+
+        # Report in source order; only the chosen pairs become MatchScores
+        chosen = [assigned[src_pos] for src_pos in sorted(assigned)]
+        matches = [
+            MatchResult(
+                source_transaction=sources[src_list[pair]],
+                target_transaction=targets[tgt_pos],
+                score=score,
+                status=MatchStatus.UNMATCHED,
+                matched_by="fuzzy",
+            )
+            for pair, (tgt_pos, score) in zip(
+                chosen,
+                self._match_scores(positions[chosen], components[chosen]),
+                strict=True,
+            )
+        ]
+
+        logger.info("Stage 2/3 (fuzzy): %d potential matches", len(matches))
         return matches
 
+    def _candidate_positions(
+        self, sources: list[NormalizedTransaction], index: _CandidateIndex
+    ) -> Iterator[np.ndarray]:
+        """Yield, per source, the target positions worth scoring."""
+        # Only prune when skipped pairs could never have made the review queue
+        if _TEXT_ONLY_CEILING < self.manual_review_threshold:
+            return index.candidates(sources)
+        every_target = np.arange(len(index.amounts))
+        return (every_target for _ in sources)
+
+    def _score_sources(
+        self,
+        sources: list[NormalizedTransaction],
+        targets: list[NormalizedTransaction],
+        index: _CandidateIndex,
+    ) -> _ScoredChunk:
+        """
+        Score sources against their candidates without building MatchScores.
+
+        Candidate pairs of many sources are scored together in blocks of up to
+        _BLOCK_PAIRS, so the amount, date and reference scores are each one
+        NumPy expression per block rather than one call per source.
+
+        Returns:
+            Scored pairs reaching the review threshold, as a _ScoredChunk
+        """
+        blocks = []
+        block_sources: list[NormalizedTransaction] = []
+        block_candidates: list[np.ndarray] = []
+        block_pairs = 0
+        for source, positions in zip(
+            sources, self._candidate_positions(sources, index), strict=True
+        ):
+            block_sources.append(source)
+            block_candidates.append(positions)
+            block_pairs += len(positions)
+            if block_pairs >= _BLOCK_PAIRS:
+                blocks.append(
+                    self._score_block(block_sources, block_candidates, targets, index)
+                )
+                block_sources, block_candidates, block_pairs = [], [], 0
+        if block_sources or not blocks:
+            blocks.append(
+                self._score_block(block_sources, block_candidates, targets, index)
+            )
+        return _concat_chunks(blocks)
+
+    def _score_block(
+        self,
+        sources: list[NormalizedTransaction],
+        candidates: list[np.ndarray],
+        targets: list[NormalizedTransaction],
+        index: _CandidateIndex,
+    ) -> _ScoredChunk:
+        """Score one block of sources, given each source's candidate positions."""
+        scorer = self.scorer
+
+        # One flat (source, target) pair per candidate, grouped by source
+        counts = np.array([len(c) for c in candidates], dtype=np.int64)
+        src = np.repeat(np.arange(len(sources)), counts)
+        tgt = np.concatenate(candidates) if candidates else np.empty(0, np.int64)
+
+        # Amount, date and reference scores for every pair at once
+        src_amounts = np.array([s.amount_cents for s in sources], dtype=np.int64)
+        src_days = np.array(
+            [s.transaction_date.toordinal() for s in sources], dtype=np.int64
+        )
+        amount_scores = scorer.amount_matcher.score_arrays(
+            src_amounts[src], index.amounts[tgt]
+        )
+        date_scores = scorer.date_matcher.score_arrays(src_days[src], index.days[tgt])
+        ref_bonuses = np.where(
+            index.reference_ids(sources)[src] == index.ref_ids[tgt],
+            scorer.WEIGHT_REF_BONUS,
+            0.0,
+        )
+
+        # Text similarity is at most 1, so pairs that miss the review
+        # threshold even with a perfect text score are dropped before any
+        # fuzzy matching runs
+        reachable = np.flatnonzero(
+            MatchScore.weighted_total(amount_scores, 1.0, date_scores, ref_bonuses)
+            >= self.manual_review_threshold
+        )
+        src = src[reachable]
+        tgt = tgt[reachable]
+        amount_scores = amount_scores[reachable]
+        date_scores = date_scores[reachable]
+        ref_bonuses = ref_bonuses[reachable]
+
+        # Text scores per source, since each source is one cdist query
+        text_scores = np.empty(len(tgt))
+        bounds = np.searchsorted(src, np.arange(len(sources) + 1)).tolist()
+        for source, lo, hi in zip(sources, bounds[:-1], bounds[1:], strict=True):
+            if lo < hi:
+                text_scores[lo:hi] = self._text_scores(source, tgt[lo:hi], targets)
+
+        # Only pairs that reach the review queue are kept
+        totals = MatchScore.weighted_total(
+            amount_scores, text_scores, date_scores, ref_bonuses
+        )
+        keep = np.flatnonzero(totals >= self.manual_review_threshold)
+        components = np.column_stack(
+            (amount_scores, text_scores, date_scores, ref_bonuses)
+        )
+        return (
+            np.bincount(src[keep], minlength=len(sources)),
+            tgt[keep],
+            components[keep],
+        )
+
+    def _text_scores(
+        self,
+        source: NormalizedTransaction,
+        positions: np.ndarray,
+        targets: list[NormalizedTransaction],
+    ) -> np.ndarray:
+        """Text scores of a source against targets, from the cache where possible."""
+        # Forked workers read what was cached before the pool started; what
+        # they add stays in the worker.
+        text_cache = self._text_cache
+        candidates = [targets[pos] for pos in positions.tolist()]
+        keys = [(source.id, target.id) for target in candidates]
+        text_scores = text_cache.get_many(keys)
+        missing = np.flatnonzero(np.isnan(text_scores))
+        if missing.size:
+            computed = self.scorer.text_scores(
+                source, [candidates[i] for i in missing.tolist()]
+            )
+            text_scores[missing] = computed
+            text_cache.update(
+                zip(
+                    [keys[i] for i in missing.tolist()],
+                    computed.tolist(),
+                    strict=True,
+                )
+            )
+        return text_scores
+
+    @staticmethod
+    def _match_scores(
+        positions: np.ndarray, components: np.ndarray
+    ) -> Iterator[tuple[int, MatchScore]]:
+        """Yield (position, MatchScore) from _score_block() component rows."""
+        for pos, (amount_score, text_score, date_score, ref_bonus) in zip(
+            positions.tolist(), components.tolist(), strict=True
+        ):
+            yield pos, MatchScore(
+                amount_score=amount_score,
+                text_score=text_score,
+                date_score=date_score,
+                reference_bonus=ref_bonus,
+            )
+
+    def _worker_count(self, n_sources: int, n_targets: int) -> int:
+        """Number of processes to score with; 1 means score in-process."""
+        if n_sources * n_targets < _PARALLEL_MIN_PAIRS:
+            return 1
+        if "fork" not in multiprocessing.get_all_start_methods():
+            return 1
+        n_jobs = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        return max(1, min(n_jobs, n_sources))
+
+    def _score_parallel(
+        self,
+        sources: list[NormalizedTransaction],
+        targets: list[NormalizedTransaction],
+        index: _CandidateIndex,
+        workers: int,
+    ) -> list[_ScoredChunk]:
+        """
+        Score every source's candidates across a pool of forked processes.
+
+        Workers score without knowing which targets earlier sources consume;
+        the caller applies consumption during its greedy pass, so the result
+        is the same as scoring in-process.
+        """
+        global _WORKER_STATE
+
+        size = math.ceil(len(sources) / workers)
+        bounds = [
+            (start, min(start + size, len(sources)))
+            for start in range(0, len(sources), size)
+        ]
+
+        _WORKER_STATE = (self, sources, targets, index)
+        try:
+            with ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context("fork")
+            ) as pool:
+                chunks = list(pool.map(_score_chunk, bounds))
+        finally:
+            _WORKER_STATE = None
+
+        return chunks
+
     def _build_summary(
         self,
         sources: list[NormalizedTransaction],
@@ -185,9 +616,12 @@ class ReconciliationEngine:
         manual_review_count: int,
     ) -> ReconciliationSummary:
         """Build reconciliation summary statistics."""
-        matched_amount = sum(s.amount for s in sources if s.id in matched_source_ids)
-        unmatched_amount = sum(
-            s.amount for s in sources if s.id not in matched_source_ids
+        # Sum in integer cents; convert to Decimal only for the summary
+        matched_cents = sum(
+            s.amount_cents for s in sources if s.id in matched_source_ids
+        )
+        unmatched_cents = sum(
+            s.amount_cents for s in sources if s.id not in matched_source_ids
         )
 
         return ReconciliationSummary(
@@ -198,6 +632,6 @@ class ReconciliationEngine:
             unmatched_target_count=len(targets) - len(matched_target_ids),
             manual_review_count=manual_review_count,
             match_rate=len(matched_source_ids) / len(sources) if sources else 0.0,
-            total_matched_amount=matched_amount,
-            total_unmatched_amount=unmatched_amount,
+            total_matched_amount=Decimal(matched_cents).scaleb(-2),
+            total_unmatched_amount=Decimal(unmatched_cents).scaleb(-2),
         )
@@ -1,7 +1,10 @@
 """Amount matching with tolerance."""
 
+import math
 from decimal import Decimal
 
+import numpy as np
+
 from src.models.transaction import NormalizedTransaction
 
 
@@ -30,6 +33,7 @@ class AmountMatcher:
         """
         self.percentage_tolerance = percentage_tolerance
         self.absolute_tolerance = absolute_tolerance
+        self._absolute_tolerance_cents = float(absolute_tolerance * 100)
 
     def score(self, txn1: NormalizedTransaction, txn2: NormalizedTransaction) -> float:
         """
@@ -38,8 +42,13 @@ class AmountMatcher:
         Returns:
             Score from 0 to 1 (1 = exact match)
         """
-        amt1 = abs(txn1.amount)
-        amt2 = abs(txn2.amount)
+        return self._score_cents(txn1.amount_cents, txn2.amount_cents)
+
+    def _score_cents(self, cents1: int, cents2: int) -> float:
+        """Score two amounts given in integer cents (sign is ignored)."""
+        # Integer cents: exact for currency and far cheaper than Decimal
+        amt1 = abs(cents1)
+        amt2 = abs(cents2)
 
         if amt1 == amt2:
             return 1.0
@@ -50,7 +59,7 @@ class AmountMatcher:
         # Calculate percentage difference
         diff = abs(amt1 - amt2)
         avg = (amt1 + amt2) / 2
-        pct_diff = float(diff / avg)
+        pct_diff = diff / avg
 
         # Perfect score if within tolerance
         if pct_diff <= self.percentage_tolerance:
@@ -58,7 +67,7 @@ class AmountMatcher:
             return 1.0 - (pct_diff / self.percentage_tolerance) * 0.1
 
         # Check absolute tolerance for small amounts
-        if diff <= self.absolute_tolerance:
+        if diff <= self._absolute_tolerance_cents:
             return 0.95
 
         # Score falls off gradually
@@ -67,6 +76,64 @@ class AmountMatcher:
 
         return 0.0
 
+    def score_arrays(
+        self, amounts1_cents: np.ndarray, amounts2_cents: np.ndarray
+    ) -> np.ndarray:
+        """
+        Score amounts pairwise, element by element (with broadcasting).
+
+        Evaluates the same branches as score(), in the same order and with the
+        same float operations, so each element equals the scalar score.
+
+        Args:
+            amounts1_cents: Amounts in integer cents (sign is ignored)
+            amounts2_cents: Amounts to compare them with, in integer cents
+
+        Returns:
+            Array of scores, one per pair
+        """
+        amt1 = np.abs(amounts1_cents)
+        amt2 = np.abs(amounts2_cents)
+        tol = self.percentage_tolerance
+
+        diff = np.abs(amt1 - amt2)
+        # Branches that don't apply may divide by zero; np.select discards them
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_diff = diff / ((amt1 + amt2) / 2)
+            within_pct = 1.0 - (pct_diff / tol) * 0.1
+
+        return np.select(
+            [
+                amt2 == amt1,
+                (amt2 == 0) | (amt1 == 0),
+                pct_diff <= tol,
+                diff <= self._absolute_tolerance_cents,
+                pct_diff < 0.10,
+            ],
+            [1.0, 0.0, within_pct, 0.95, np.maximum(0.5, 1.0 - pct_diff)],
+            default=0.0,
+        )
+
+    def score_matrix(
+        self,
+        sources: list[NormalizedTransaction],
+        targets: list[NormalizedTransaction],
+    ) -> np.ndarray:
+        """
+        Score every source amount against every target amount.
+
+        Amounts are gathered once into contiguous int64 cent arrays and
+        broadcast through score_arrays, so there is no per-pair Python work.
+        Memory is O(N x M); the engine scores only candidate pairs instead.
+
+        Returns:
+            Array of shape (len(sources), len(targets)); element [i, j]
+            equals score(sources[i], targets[j])
+        """
+        src = np.array([t.amount_cents for t in sources], dtype=np.int64)
+        tgt = np.array([t.amount_cents for t in targets], dtype=np.int64)
+        return self.score_arrays(src[:, None], tgt[None, :])
+
     def is_match(
         self, txn1: NormalizedTransaction, txn2: NormalizedTransaction
     ) -> bool:
@@ -78,3 +145,18 @@ class AmountMatcher:
     ) -> Decimal:
         """Get absolute difference between amounts."""
         return abs(txn1.amount - txn2.amount)
+
+    def get_amount_range(self, txn: NormalizedTransaction) -> tuple[float, float]:
+        """
+        Get the window of absolute amounts, in cents, that can score above zero.
+
+        The window is padded outwards: every amount scoring above zero falls
+        inside it, but not every amount inside it scores above zero.
+        """
+        amt = abs(txn.amount_cents)
+        tol = self._absolute_tolerance_cents + 1
+        # |a - b| <= p * (a + b) / 2  <=>  a(1 - p/2)/(1 + p/2) <= b <= a(1 + p/2)/(1 - p/2)
+        half = max(0.10, self.percentage_tolerance) / 2
+        low = amt * (1 - half) / (1 + half) - tol
+        high = amt * (1 + half) / (1 - half) + tol if half < 1 else math.inf
+        return low, high
@@ -2,6 +2,8 @@
 
 from datetime import date, timedelta
 
+import numpy as np
+
 from src.models.transaction import NormalizedTransaction
 
 
@@ -42,6 +44,41 @@ class DateMatcher:
         # Linear decay within window
         return 1.0 - (days_diff / (self.window_days + 1))
 
+    def score_arrays(self, ordinals1: np.ndarray, ordinals2: np.ndarray) -> np.ndarray:
+        """
+        Score dates pairwise, element by element (with broadcasting).
+
+        Args:
+            ordinals1: Dates as date.toordinal() values
+            ordinals2: Dates to compare them with, as ordinals
+
+        Returns:
+            Array of scores, one per pair (each equal to the scalar score)
+        """
+        days_diff = np.abs(ordinals2 - ordinals1)
+
+        return np.select(
+            [days_diff == 0, days_diff > self.window_days],
+            [1.0, 0.0],
+            default=1.0 - (days_diff / (self.window_days + 1)),
+        )
+
+    def score_matrix(
+        self,
+        sources: list[NormalizedTransaction],
+        targets: list[NormalizedTransaction],
+    ) -> np.ndarray:
+        """
+        Score every source date against every target date.
+
+        Returns:
+            Array of shape (len(sources), len(targets)); element [i, j]
+            equals score(sources[i], targets[j])
+        """
+        src = np.array([t.transaction_date.toordinal() for t in sources], np.int64)
+        tgt = np.array([t.transaction_date.toordinal() for t in targets], np.int64)
+        return self.score_arrays(src[:, None], tgt[None, :])
+
     def is_match(
         self, txn1: NormalizedTransaction, txn2: NormalizedTransaction
     ) -> bool:
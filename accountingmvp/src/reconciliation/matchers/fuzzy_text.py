@@ -1,9 +1,48 @@
 """Fuzzy text matching using RapidFuzz."""
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import Indel
 
 from src.models.transaction import NormalizedTransaction
 
+# Algorithms compared by _best_match; the best of them wins
+_SCORERS = (
+    fuzz.ratio,
+    fuzz.partial_ratio,
+    fuzz.token_sort_ratio,
+    fuzz.token_set_ratio,
+)
+
+
+def _best_match_score(s1: str, s2: str) -> float:
+    """Best score of all algorithms for a pair of normalized strings (0-1)."""
+    # Identical strings score 100 under fuzz.ratio, so nothing can beat them
+    if s1 == s2:
+        return 1.0
+
+    # fuzz.ratio is the normalized Indel similarity scaled to 0-100; calling
+    # the distance directly skips the fuzz wrapper and gives the same value
+    best = Indel.normalized_similarity(s1, s2) * 100
+
+    # Each remaining algorithm only has to beat the running best, so
+    # score_cutoff lets RapidFuzz bail out early (returning 0) and a perfect
+    # score skips the rest.
+    for scorer in _SCORERS[1:]:
+        if best >= 100:
+            break
+        best = max(best, scorer(s1, s2, score_cutoff=best))
+    return best / 100
+
+
+def _distinct_index(values: list[str | None]) -> dict[str, int]:
+    """Map each distinct non-None value to its position among them."""
+    slots: dict[str, int] = {}
+    for value in values:
+        if value is not None:
+            slots.setdefault(value, len(slots))
+    return slots
+
 
 class FuzzyTextMatcher:
     """
@@ -16,6 +55,8 @@ class FuzzyTextMatcher:
     - Token Set: Handles duplicates and order
     """
 
+    SCORERS = _SCORERS
+
     def __init__(self, threshold: float = 0.70):
         """
         Initialize matcher.
@@ -34,11 +75,26 @@ class FuzzyTextMatcher:
         Returns:
             Similarity score from 0 to 1
         """
+        return self.score_normalized(
+            txn1.match_description,
+            txn1.match_reference,
+            txn2.match_description,
+            txn2.match_reference,
+        )
+
+    def score_normalized(
+        self,
+        desc1: str | None,
+        ref1: str | None,
+        desc2: str | None,
+        ref2: str | None,
+    ) -> float:
+        """Like score(), on fields already passed through normalize()."""
         # Compare descriptions
-        desc_score = self._best_match(txn1.description, txn2.description)
+        desc_score = self._best_match(desc1, desc2)
 
         # Compare references
-        ref_score = self._best_match(txn1.reference, txn2.reference)
+        ref_score = self._best_match(ref1, ref2)
 
         # Weight descriptions more heavily, but give bonus for reference match
         if ref_score > 0.95:  # Near-exact reference match
@@ -46,24 +102,140 @@ class FuzzyTextMatcher:
 
         return 0.7 * desc_score + 0.3 * ref_score
 
-    def _best_match(self, str1: str, str2: str) -> float:
-        """Get best match score using multiple algorithms."""
-        if not str1 or not str2:
-            return 0.0
+    def score_many(
+        self,
+        desc: str | None,
+        ref: str | None,
+        descs: list[str | None],
+        refs: list[str | None],
+    ) -> np.ndarray:
+        """
+        Score one normalized description/reference pair against many.
 
-        # Normalize strings
-        s1 = str1.lower().strip()
-        s2 = str2.lower().strip()
+        Equivalent to score_normalized() per element, but each algorithm runs
+        once over all choices via rapidfuzz.process.cdist instead of once per
+        pair from Python.
 
-        # Try multiple algorithms and take the best
-        scores = [
-            fuzz.ratio(s1, s2) / 100,
-            fuzz.partial_ratio(s1, s2) / 100,
-            fuzz.token_sort_ratio(s1, s2) / 100,
-            fuzz.token_set_ratio(s1, s2) / 100,
-        ]
+        Args:
+            desc: Normalized description (see normalize())
+            ref: Normalized reference
+            descs: Normalized descriptions to compare against
+            refs: Normalized references, aligned with ``descs``
 
-        return max(scores)
+        Returns:
+            Array of similarity scores from 0 to 1, one per choice
+        """
+        desc_scores = self._best_match_many(desc, descs)
+        ref_scores = self._best_match_many(ref, refs)
+        return self._combine(desc_scores, ref_scores)
+
+    def score_matrix(
+        self,
+        sources: list[NormalizedTransaction],
+        targets: list[NormalizedTransaction],
+    ) -> np.ndarray:
+        """
+        Score every source against every target.
+
+        Each algorithm runs once per field over the distinct source x target
+        strings via rapidfuzz.process.cdist (multi-threaded), instead of once
+        per pair from Python.
+
+        Returns:
+            Array of shape (len(sources), len(targets)); element [i, j]
+            equals score(sources[i], targets[j])
+        """
+        desc_scores = self._best_match_matrix(
+            [t.match_description for t in sources],
+            [t.match_description for t in targets],
+        )
+        ref_scores = self._best_match_matrix(
+            [t.match_reference for t in sources],
+            [t.match_reference for t in targets],
+        )
+        return self._combine(desc_scores, ref_scores)
+
+    @staticmethod
+    def _combine(desc_scores: np.ndarray, ref_scores: np.ndarray) -> np.ndarray:
+        """score_normalized()'s weighting, element-wise over score arrays."""
+        return np.where(
+            ref_scores > 0.95,
+            np.minimum(1.0, 0.6 * desc_scores + 0.4 * ref_scores + 0.1),
+            0.7 * desc_scores + 0.3 * ref_scores,
+        )
+
+    @staticmethod
+    def normalize(text: str) -> str | None:
+        """
+        Lowercase and strip a field; None marks an empty field.
+
+        NormalizedTransaction applies the same rule once, at construction, to
+        fill match_description and match_reference.
+        """
+        return text.lower().strip() if text else None
+
+    def _best_match(self, s1: str | None, s2: str | None) -> float:
+        """Get best match score of two normalized strings using multiple algorithms."""
+        if s1 is None or s2 is None:
+            return 0.0
+        return _best_match_score(s1, s2)
+
+    def _best_match_many(self, s: str | None, choices: list[str | None]) -> np.ndarray:
+        """_best_match() of one string against many; None choices score 0."""
+        if s is None or not choices:
+            return np.zeros(len(choices))
+
+        # Statements repeat descriptions and references a lot, so each
+        # distinct choice is scored once and the results are scattered back
+        slots: dict[str | None, int] = {}
+        inverse = np.array([slots.setdefault(c, len(slots)) for c in choices])
+        unique = list(slots)
+
+        # float64 so each cell equals the scalar fuzz.* result exactly. Scores
+        # below every running best cannot change the max, so they are cut off.
+        best = np.zeros(len(unique))
+        for scorer in self.SCORERS:
+            scores = process.cdist(
+                [s], unique, scorer=scorer, dtype=np.float64, score_cutoff=best.min()
+            )[0]
+            np.maximum(best, scores, out=best)
+            if best.min() >= 100:
+                break
+        return best[inverse] / 100
+
+    def _best_match_matrix(
+        self, queries: list[str | None], choices: list[str | None]
+    ) -> np.ndarray:
+        """_best_match() of every query against every choice; None scores 0."""
+        # Statements repeat descriptions and references a lot, so each
+        # distinct string is scored once and the results are scattered back.
+        # None maps to index -1, a trailing row/column of zeros.
+        query_slots = _distinct_index(queries)
+        choice_slots = _distinct_index(choices)
+        best = np.zeros((len(query_slots) + 1, len(choice_slots) + 1))
+
+        if query_slots and choice_slots:
+            # float64 so each cell equals the scalar fuzz.* result exactly.
+            # Scores below every running best cannot change the max, so they
+            # are cut off.
+            found = best[:-1, :-1]
+            for scorer in self.SCORERS:
+                scores = process.cdist(
+                    list(query_slots),
+                    list(choice_slots),
+                    scorer=scorer,
+                    dtype=np.float64,
+                    score_cutoff=found.min(),
+                    workers=-1,
+                )
+                np.maximum(found, scores, out=found)
+                if found.min() >= 100:
+                    break
+            found /= 100
+
+        rows = np.array([query_slots.get(q, -1) for q in queries], dtype=np.intp)
+        cols = np.array([choice_slots.get(c, -1) for c in choices], dtype=np.intp)
+        return best[np.ix_(rows, cols)]
 
     def is_match(
         self, txn1: NormalizedTransaction, txn2: NormalizedTransaction
@@ -1,12 +1,50 @@
 """Reconciliation report generator."""
 
+import csv
+import io
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from typing import TextIO
 
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 
 from src.models.enums import MatchStatus
 from src.models.match import MatchResult, ReconciliationSummary
 
+from .xlsx_stream import StreamingXlsxWriter
+
+# Columns of a match report, in order
+MATCH_COLUMNS = (
+    "Source Date",
+    "Source Amount",
+    "Source Reference",
+    "Source Description",
+    "Target Date",
+    "Target Amount",
+    "Target Reference",
+    "Target Description",
+    "Confidence",
+    "Status",
+    "Matched By",
+)
+
+# Report descriptions are cut to this many characters
+_DESCRIPTION_CHARS = 50
+
+# From this many matches, generate_excel() streams the workbook as raw XML
+# (generate_excel_fast); openpyxl's per-cell work is ~10x slower at 100k rows
+_STREAM_EXCEL_MIN_MATCHES = 10_000
+
+# Excel sheet per match status, in sheet order
+_STATUS_SHEETS = {
+    MatchStatus.MATCHED: "Matched",
+    MatchStatus.MANUAL_REVIEW: "Manual Review",
+    MatchStatus.UNMATCHED: "Unmatched",
+}
+
 
 class ReportGenerator:
     """
@@ -30,6 +68,63 @@ class ReportGenerator:
         """
         Generate Excel report with multiple sheets.
 
+        Reports of _STREAM_EXCEL_MIN_MATCHES or more matches are handed to
+        generate_excel_fast(), which writes the same sheets and values.
+
+        Args:
+            matches: List of match results
+            summary: Reconciliation summary
+            output_path: Path to save Excel file
+
+        Returns:
+            Path to generated file
+        """
+        if len(matches) >= _STREAM_EXCEL_MIN_MATCHES:
+            return self.generate_excel_fast(matches, summary, output_path)
+
+        # Bucket by status in a single pass
+        buckets: dict[MatchStatus, list[MatchResult]] = {s: [] for s in MatchStatus}
+        for m in matches:
+            buckets[m.status].append(m)
+
+        # Write-only mode streams rows to disk instead of keeping a cell
+        # object per value alive until save; openpyxl serializes them with
+        # lxml's incremental writer when it is installed
+        wb = Workbook(write_only=True)
+
+        # Summary sheet
+        summary_df = self._summary_to_df(summary)
+        ws = wb.create_sheet("Summary")
+        self._append_header(ws, summary_df.columns)
+        for row in summary_df.itertuples(index=False):
+            ws.append(row)
+
+        # One sheet per non-empty status bucket
+        for status, sheet_name in _STATUS_SHEETS.items():
+            bucket = buckets[status]
+            if bucket:
+                ws = wb.create_sheet(sheet_name)
+                self._append_header(ws, MATCH_COLUMNS)
+                for row in self._match_rows(bucket):
+                    ws.append(row)
+
+        wb.save(output_path)
+        return output_path
+
+    def generate_excel_fast(
+        self,
+        matches: list[MatchResult],
+        summary: ReconciliationSummary,
+        output_path: str,
+    ) -> str:
+        """
+        Generate the same sheets as generate_excel(), streamed as raw XML.
+
+        Skips openpyxl entirely (see StreamingXlsxWriter), which pays off for
+        very large exports (100k+ matches). Cell values and sheet layout match
+        generate_excel(); only styling beyond bold headers and date formats
+        is left out.
+
         Args:
             matches: List of match results
             summary: Reconciliation summary
@@ -38,39 +133,51 @@ class ReportGenerator:
         Returns:
             Path to generated file
         """
-        with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-            # Summary sheet
-            summary_df = self._summary_to_df(summary)
-            summary_df.to_excel(writer, sheet_name="Summary", index=False)
-
-            # Matched transactions
-            matched = [m for m in matches if m.status == MatchStatus.MATCHED]
-            if matched:
-                matched_df = self._matches_to_df(matched)
-                matched_df.to_excel(writer, sheet_name="Matched", index=False)
-
-            # Manual review
-            review = [m for m in matches if m.status == MatchStatus.MANUAL_REVIEW]
-            if review:
-                review_df = self._matches_to_df(review)
-                review_df.to_excel(writer, sheet_name="Manual Review", index=False)
-
-            # Unmatched
-            unmatched = [m for m in matches if m.status == MatchStatus.UNMATCHED]
-            if unmatched:
-                unmatched_df = self._matches_to_df(unmatched)
-                unmatched_df.to_excel(writer, sheet_name="Unmatched", index=False)
+        buckets: dict[MatchStatus, list[MatchResult]] = {s: [] for s in MatchStatus}
+        for m in matches:
+            buckets[m.status].append(m)
+
+        summary_df = self._summary_to_df(summary)
+        with StreamingXlsxWriter(output_path) as writer:
+            writer.write_sheet(
+                "Summary",
+                summary_df.columns,
+                summary_df.itertuples(index=False),
+            )
+            for status, sheet_name in _STATUS_SHEETS.items():
+                bucket = buckets[status]
+                if bucket:
+                    writer.write_sheet(
+                        sheet_name, MATCH_COLUMNS, self._match_rows(bucket)
+                    )
 
         return output_path
 
     def generate_csv(self, matches: list[MatchResult]) -> str:
         """Generate CSV string of all matches."""
-        df = self._matches_to_df(matches)
-        return df.to_csv(index=False)
+        buffer = io.StringIO()
+        self._write_csv(matches, buffer)
+        return buffer.getvalue()
 
     def generate_csv_bytes(self, matches: list[MatchResult]) -> bytes:
         """Generate CSV as bytes for download."""
-        return self.generate_csv(matches).encode("utf-8")
+        buffer = io.BytesIO()
+        # Encode while writing rather than building and encoding a str
+        wrapper = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        self._write_csv(matches, wrapper)
+        wrapper.flush()
+        wrapper.detach()
+        return buffer.getvalue()
+
+    def _write_csv(self, matches: list[MatchResult], stream: TextIO) -> None:
+        """Write the match report as CSV, one row per match, without a frame."""
+        if not matches:
+            # An empty frame serializes to a blank line, not a header
+            stream.write("\n")
+            return
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(MATCH_COLUMNS)
+        writer.writerows(self._match_rows(matches))
 
     def _summary_to_df(self, summary: ReconciliationSummary) -> pd.DataFrame:
         """Convert summary to DataFrame."""
@@ -102,23 +209,32 @@ class ReportGenerator:
         }
         return pd.DataFrame(data)
 
-    def _matches_to_df(self, matches: list[MatchResult]) -> pd.DataFrame:
-        """Convert matches to DataFrame."""
-        rows = []
+    @staticmethod
+    def _append_header(ws, columns: Iterable[str]) -> None:
+        """Append a bold header row, as pandas' to_excel would write it."""
+        bold = Font(bold=True)
+        cells = []
+        for column in columns:
+            cell = WriteOnlyCell(ws, value=column)
+            cell.font = bold
+            cells.append(cell)
+        ws.append(cells)
+
+    def _match_rows(self, matches: list[MatchResult]) -> Iterator[tuple]:
+        """Yield one report row per match, in MATCH_COLUMNS order."""
         for m in matches:
-            rows.append(
-                {
-                    "Source Date": m.source_transaction.transaction_date,
-                    "Source Amount": float(m.source_transaction.amount),
-                    "Source Reference": m.source_transaction.reference,
-                    "Source Description": m.source_transaction.description[:50],
-                    "Target Date": m.target_transaction.transaction_date,
-                    "Target Amount": float(m.target_transaction.amount),
-                    "Target Reference": m.target_transaction.reference,
-                    "Target Description": m.target_transaction.description[:50],
-                    "Confidence": f"{m.score.total_score:.0%}",
-                    "Status": m.status.value,
-                    "Matched By": m.matched_by,
-                }
+            source, target = m.source_transaction, m.target_transaction
+            yield (
+                source.transaction_date,
+                # The exact Decimal; amount_cents is rounded to whole cents
+                source.amount,
+                source.reference,
+                source.description[:_DESCRIPTION_CHARS],
+                target.transaction_date,
+                target.amount,
+                target.reference,
+                target.description[:_DESCRIPTION_CHARS],
+                f"{m.score.total_score:.0%}",
+                m.status.value,
+                m.matched_by,
             )
-        return pd.DataFrame(rows)
@@ -1,5 +1,7 @@
 """Confidence scoring for reconciliation matches."""
 
+import numpy as np
+
 from src.models.match import MatchConfidence, MatchScore
 from src.models.transaction import NormalizedTransaction
 
@@ -23,13 +25,22 @@ class ConfidenceScorer:
     WEIGHT_DATE = 0.20
     WEIGHT_REF_BONUS = 0.10
 
-    def __init__(self):
+    def __init__(self, date_window_days: int = 3):
+        """
+        Initialize scorer.
+
+        Args:
+            date_window_days: Days apart two dates may be and still score
+        """
         self.text_matcher = FuzzyTextMatcher()
         self.amount_matcher = AmountMatcher()
-        self.date_matcher = DateMatcher()
+        self.date_matcher = DateMatcher(window_days=date_window_days)
 
     def calculate_score(
-        self, source: NormalizedTransaction, target: NormalizedTransaction
+        self,
+        source: NormalizedTransaction,
+        target: NormalizedTransaction,
+        reference_bonus: float | None = None,
     ) -> MatchScore:
         """
         Calculate detailed match score between two transactions.
@@ -37,31 +48,53 @@ class ConfidenceScorer:
         Args:
             source: Source transaction (e.g., bank statement)
             target: Target transaction (e.g., invoice)
+            reference_bonus: Bonus already known from a reference index;
+                computed from the pair when omitted
 
         Returns:
             MatchScore with breakdown
         """
-        amount_score = self.amount_matcher.score(source, target)
-        text_score = self.text_matcher.score(source, target)
-        date_score = self.date_matcher.score(source, target)
+        return MatchScore(
+            amount_score=self.amount_matcher.score(source, target),
+            text_score=self.text_score(source, target),
+            date_score=self.date_matcher.score(source, target),
+            reference_bonus=(
+                self.reference_bonus(source, target)
+                if reference_bonus is None
+                else reference_bonus
+            ),
+        )
 
-        # Reference bonus for exact match
-        ref_bonus = 0.1 if self._exact_reference_match(source, target) else 0.0
+    def text_score(
+        self, source: NormalizedTransaction, target: NormalizedTransaction
+    ) -> float:
+        """Description/reference similarity; the costly part of a pair score."""
+        return self.text_matcher.score_normalized(
+            source.match_description,
+            source.match_reference,
+            target.match_description,
+            target.match_reference,
+        )
 
-        return MatchScore(
-            amount_score=amount_score,
-            text_score=text_score,
-            date_score=date_score,
-            reference_bonus=ref_bonus,
+    def reference_bonus(
+        self, source: NormalizedTransaction, target: NormalizedTransaction
+    ) -> float:
+        """Bonus for an exact (case- and whitespace-insensitive) reference match."""
+        exact_ref = (
+            source.reference_key and source.reference_key == target.reference_key
         )
+        return self.WEIGHT_REF_BONUS if exact_ref else 0.0
 
-    def _exact_reference_match(
-        self, t1: NormalizedTransaction, t2: NormalizedTransaction
-    ) -> bool:
-        """Check for exact reference match."""
-        ref1 = t1.reference.strip().upper()
-        ref2 = t2.reference.strip().upper()
-        return ref1 and ref2 and ref1 == ref2
+    def text_scores(
+        self, source: NormalizedTransaction, targets: list[NormalizedTransaction]
+    ) -> np.ndarray:
+        """text_score() of one source against many targets, in one batch."""
+        return self.text_matcher.score_many(
+            source.match_description,
+            source.match_reference,
+            [t.match_description for t in targets],
+            [t.match_reference for t in targets],
+        )
 
     def get_confidence_level(self, score: MatchScore) -> MatchConfidence:
         """Get confidence level from score."""
@@ -0,0 +1,230 @@
+"""Minimal streaming .xlsx writer for very large reports."""
+
+import re
+import zipfile
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from xml.sax.saxutils import escape
+
+# Excel stores dates as days since 1899-12-30
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+_EXCEL_EPOCH_ORDINAL = _EXCEL_EPOCH.toordinal()
+
+# Characters XML 1.0 cannot carry, even escaped
+_ILLEGAL_XML_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Extra escapes for text inside a double-quoted attribute
+_ATTR_ENTITIES = {'"': "&quot;"}
+
+# Cell style indexes into _STYLES' cellXfs
+_STYLE_HEADER = 1
+_STYLE_DATE = 2
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    "{sheets}"
+    "</Types>"
+)
+
+_SHEET_CONTENT_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<sheets>{sheets}</sheets>"
+    "</workbook>"
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    "{sheets}"
+    '<Relationship Id="rIdStyles" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '<Relationship Id="rIdStrings" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+    "</Relationships>"
+)
+
+# Default style, bold header, and yyyy-mm-dd dates
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    "</borders>"
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+    "</cellStyleXfs>"
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" '
+    'applyNumberFormat="1"/>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    "</cellStyles>"
+    "</styleSheet>"
+)
+
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+def _column_letter(index: int) -> str:
+    """Spreadsheet column name for a 0-based column index (0 -> A)."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+class StreamingXlsxWriter:
+    """
+    Write an .xlsx workbook by streaming worksheet XML into the zip container.
+
+    No cell objects are created: each row is rendered straight to XML and
+    written to the open zip entry. Strings go through a shared-strings table,
+    so a descriptor repeated across thousands of rows is stored once.
+    Supports str, int, float, Decimal, date/datetime and None values; None
+    and "" leave the cell empty, as openpyxl does.
+
+    Usage:
+        with StreamingXlsxWriter(path) as writer:
+            writer.write_sheet("Matched", header, rows)
+    """
+
+    def __init__(self, output_path: str):
+        self._zip = zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED)
+        self._sheet_names: list[str] = []
+        self._strings: dict[str, int] = {}
+
+    def __enter__(self) -> "StreamingXlsxWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+
+    def write_sheet(
+        self, name: str, header: Iterable[str], rows: Iterable[Iterable]
+    ) -> None:
+        """Write one worksheet: a bold header row, then ``rows``."""
+        self._sheet_names.append(name)
+        path = f"xl/worksheets/sheet{len(self._sheet_names)}.xml"
+        header = list(header)
+        columns = [_column_letter(i) for i in range(len(header))]
+
+        with self._zip.open(path, "w", force_zip64=True) as raw:
+            write = raw.write
+            write(_SHEET_HEAD.encode())
+            write(self._render_row(1, columns, header, _STYLE_HEADER).encode())
+            for row_num, row in enumerate(rows, start=2):
+                write(self._render_row(row_num, columns, row).encode())
+            write(_SHEET_TAIL.encode())
+
+    def close(self) -> None:
+        """Write the workbook parts and shared strings, then close the file."""
+        n_sheets = len(self._sheet_names)
+        self._zip.writestr(
+            "[Content_Types].xml",
+            _CONTENT_TYPES.format(
+                sheets="".join(
+                    _SHEET_CONTENT_TYPE.format(n=n) for n in range(1, n_sheets + 1)
+                )
+            ),
+        )
+        self._zip.writestr("_rels/.rels", _ROOT_RELS)
+        self._zip.writestr(
+            "xl/workbook.xml",
+            _WORKBOOK.format(
+                sheets="".join(
+                    f'<sheet name="{escape(name, _ATTR_ENTITIES)}" '
+                    f'sheetId="{n}" r:id="rId{n}"/>'
+                    for n, name in enumerate(self._sheet_names, start=1)
+                )
+            ),
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            _WORKBOOK_RELS.format(
+                sheets="".join(
+                    f'<Relationship Id="rId{n}" Type="http://schemas.openxmlformats'
+                    '.org/officeDocument/2006/relationships/worksheet" '
+                    f'Target="worksheets/sheet{n}.xml"/>'
+                    for n in range(1, n_sheets + 1)
+                )
+            ),
+        )
+        self._zip.writestr("xl/styles.xml", _STYLES)
+
+        with self._zip.open("xl/sharedStrings.xml", "w", force_zip64=True) as raw:
+            raw.write(
+                (
+                    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/'
+                    f'2006/main" uniqueCount="{len(self._strings)}">'
+                ).encode()
+            )
+            for text in self._strings:
+                raw.write(f'<si><t xml:space="preserve">{text}</t></si>'.encode())
+            raw.write(b"</sst>")
+
+        self._zip.close()
+
+    def _render_row(
+        self, row_num: int, columns: list[str], values: Iterable, style: int = 0
+    ) -> str:
+        """Render one <row> element."""
+        styled = f' s="{style}"' if style else ""
+        cells = []
+        for column, value in zip(columns, values, strict=True):
+            if value is None or value == "":
+                continue
+            ref = f"{column}{row_num}"
+            if isinstance(value, str):
+                text = escape(_ILLEGAL_XML_RE.sub("", value))
+                index = self._strings.setdefault(text, len(self._strings))
+                cells.append(f'<c r="{ref}" t="s"{styled}><v>{index}</v></c>')
+            elif isinstance(value, datetime):
+                serial = (value - _EXCEL_EPOCH) / timedelta(days=1)
+                cells.append(f'<c r="{ref}" s="{_STYLE_DATE}"><v>{serial}</v></c>')
+            elif isinstance(value, date):
+                serial = value.toordinal() - _EXCEL_EPOCH_ORDINAL
+                cells.append(f'<c r="{ref}" s="{_STYLE_DATE}"><v>{serial}</v></c>')
+            else:
+                cells.append(f'<c r="{ref}"{styled}><v>{value}</v></c>')
+        return f'<row r="{row_num}">{"".join(cells)}</row>'
@@ -5,10 +5,16 @@ from decimal import Decimal
 
 import pytest
 
+from src.models.enums import TransactionSource
 from src.models.transaction import NormalizedTransaction, RawTransaction
+from src.normalizer import NormalizationPipeline
+from src.parsers import BankCSVParser
 
+# Sample files are read-only and NormalizedTransaction is frozen, so the
+# fixtures below are built once per test session and shared.
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def sample_bank_csv_content():
     """Sample bank statement CSV content."""
     return """Date,Reference,Amount,Description
@@ -19,7 +25,7 @@ def sample_bank_csv_content():
 """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ecocash_csv_content():
     """Sample Ecocash export content."""
     return """Date,Reference,Amount,Description
@@ -29,22 +35,38 @@ def sample_ecocash_csv_content():
 """
 
 
-@pytest.fixture
-def sample_bank_csv(sample_bank_csv_content, tmp_path):
+@pytest.fixture(scope="session")
+def sample_bank_csv(sample_bank_csv_content, tmp_path_factory):
     """Create temporary bank CSV file."""
-    file_path = tmp_path / "bank_statement.csv"
+    file_path = tmp_path_factory.mktemp("samples") / "bank_statement.csv"
     file_path.write_text(sample_bank_csv_content)
     return str(file_path)
 
 
-@pytest.fixture
-def sample_ecocash_csv(sample_ecocash_csv_content, tmp_path):
+@pytest.fixture(scope="session")
+def sample_ecocash_csv(sample_ecocash_csv_content, tmp_path_factory):
     """Create temporary Ecocash CSV file."""
-    file_path = tmp_path / "ecocash_export.csv"
+    file_path = tmp_path_factory.mktemp("samples") / "ecocash_export.csv"
     file_path.write_text(sample_ecocash_csv_content)
     return str(file_path)
 
 
+@pytest.fixture(scope="session")
+def normalized_bank_txns(sample_bank_csv):
+    """Sample bank statement, parsed and normalized once per session."""
+    return NormalizationPipeline(TransactionSource.BANK_STATEMENT).process(
+        BankCSVParser().parse(sample_bank_csv)
+    )
+
+
+@pytest.fixture(scope="session")
+def normalized_ecocash_txns(sample_ecocash_csv):
+    """Sample Ecocash export, parsed and normalized once per session."""
+    return NormalizationPipeline(TransactionSource.ECOCASH).process(
+        BankCSVParser().parse(sample_ecocash_csv)
+    )
+
+
 @pytest.fixture
 def raw_transaction():
     """Sample raw transaction."""
@@ -15,26 +15,15 @@ from src.reconciliation import ReconciliationEngine
 class TestReconciliationPipeline:
     """End-to-end tests for the reconciliation pipeline."""
 
-    def test_full_pipeline_with_sample_data(self, sample_bank_csv, sample_ecocash_csv):
+    def test_full_pipeline_with_sample_data(
+        self, normalized_bank_txns, normalized_ecocash_txns
+    ):
         """Test complete pipeline from CSV to reconciliation results."""
-        # Parse bank statement
-        bank_parser = BankCSVParser()
-        bank_raw = bank_parser.parse(sample_bank_csv)
-
-        # Parse Ecocash
-        ecocash_parser = BankCSVParser()  # Using same format for test
-        ecocash_raw = ecocash_parser.parse(sample_ecocash_csv)
-
-        # Normalize
-        bank_pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
-        bank_normalized = bank_pipeline.process(bank_raw)
-
-        ecocash_pipeline = NormalizationPipeline(TransactionSource.ECOCASH)
-        ecocash_normalized = ecocash_pipeline.process(ecocash_raw)
-
         # Reconcile
         engine = ReconciliationEngine(confidence_threshold=0.70)
-        matches, summary = engine.reconcile(bank_normalized, ecocash_normalized)
+        matches, summary = engine.reconcile(
+            normalized_bank_txns, normalized_ecocash_txns
+        )
 
         # Assertions
         assert len(matches) > 0
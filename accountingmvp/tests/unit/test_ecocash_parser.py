@@ -1,5 +1,7 @@
 """Unit tests for Ecocash parser."""
 
+import time
+
 from src.parsers import EcocashParser
 
 
@@ -22,6 +24,38 @@ class TestEcocashParser:
         assert transactions[0].raw_amount == "1500"
         assert transactions[0].raw_reference == "EC001"
 
+    def test_parse_csv_keeps_raw_strings(self, tmp_path):
+        """Test that CSV values reach the normalizer exactly as written."""
+        csv_file = tmp_path / "ecocash.csv"
+        csv_file.write_text(
+            "Date,Amount,Description,Reference\n"
+            "15/01/2024,1500.00,Payment Ref: EC001,\n"
+            "16/01/2024,250.50,Transfer,00042\n"
+        )
+
+        transactions = EcocashParser().parse(str(csv_file))
+
+        assert [t.raw_amount for t in transactions] == ["1500.00", "250.50"]
+        # Blank references fall back to the description; leading zeros survive
+        assert [t.raw_reference for t in transactions] == ["EC001", "00042"]
+
+    def test_parse_csv_alternate_columns(self, tmp_path):
+        """Test alternate column names and reference extraction in CSVs."""
+        csv_file = tmp_path / "ecocash.csv"
+        csv_file.write_text(
+            "Transaction_Date,Value,Details\n"
+            '15/01/2024,"1,500.50",Payment Ref: EC001\n'
+            "16/01/2024,250,=HYPERLINK()\n"
+        )
+
+        parser = EcocashParser()
+        transactions = parser.parse(str(csv_file))
+
+        assert [t.raw_amount for t in transactions] == ["1500.50", "250"]
+        assert [t.raw_reference for t in transactions] == ["EC001", ""]
+        assert transactions[1].description == "'=HYPERLINK()"
+        assert [t.line_number for t in transactions] == [2, 3]
+
     def test_parse_text_format_received(self, tmp_path):
         """Test parsing text-based Ecocash SMS logs - received."""
         txt_file = tmp_path / "ecocash.txt"
@@ -50,6 +84,64 @@ class TestEcocashParser:
         assert transactions[0].raw_amount == "-50.00"
         assert "Sent to Jane Smith" in transactions[0].description
 
+    def test_parse_text_reference_right_after_name(self):
+        """Test that a reference directly after the name is still extracted."""
+        parser = EcocashParser()
+
+        sent = parser._extract_transaction_from_text(
+            "Sent $5.00 to Bob Ref: X1", "f", 1
+        )
+        received = parser._extract_transaction_from_text(
+            "Received $7.50 from Alice Txn AB12", "f", 2
+        )
+
+        assert sent.raw_amount == "-5.00"
+        assert sent.raw_reference == "X1"
+        assert received.raw_amount == "7.50"
+        assert received.raw_reference == "AB12"
+
+    def test_parse_text_does_not_read_date_as_amount(self, tmp_path):
+        """Test that the generic amount fallback skips over dates."""
+        txt_file = tmp_path / "ecocash.txt"
+        txt_file.write_text("Ecocash 15/01/2024 airtime $300.00\n")
+
+        parser = EcocashParser()
+        transactions = parser.parse(str(txt_file))
+
+        assert len(transactions) == 1
+        assert transactions[0].raw_amount == "300.00"
+        assert transactions[0].raw_date == "15/01/2024"
+
+    def test_parse_text_pathological_name_is_fast(self, tmp_path):
+        """Test that a huge crafted sender name is bounded and parses quickly."""
+        txt_file = tmp_path / "ecocash.txt"
+        txt_file.write_text("received $1 from " + "a " * 10000 + "x\n")
+
+        parser = EcocashParser()
+        start = time.perf_counter()
+        transactions = parser.parse(str(txt_file))
+
+        assert time.perf_counter() - start < 1.0
+        assert len(transactions) == 1
+        assert transactions[0].raw_amount == "1"
+        assert len(transactions[0].description) <= len("Received from ") + 61
+
+    def test_parse_frame_matches_parse(self, tmp_path):
+        """Test that the columnar parse path agrees with parse()."""
+        csv_file = tmp_path / "ecocash.csv"
+        csv_file.write_text(
+            "Transaction_Date,Value,Details\n"
+            '15/01/2024,"1,500.50",Payment Ref: EC001\n'
+            "16/01/2024,250,=HYPERLINK()\n"
+        )
+        txt_file = tmp_path / "ecocash.txt"
+        txt_file.write_text("You have received $100 from John Doe\n")
+
+        parser = EcocashParser()
+        for path in (str(csv_file), str(txt_file)):
+            records = parser.parse_frame(path).to_dict("records")
+            assert records == [t.model_dump() for t in parser.parse(path)]
+
     def test_validate_recognizes_ecocash_patterns(self, tmp_path):
         """Test validation recognizes Ecocash patterns."""
         txt_file = tmp_path / "ecocash.txt"
@@ -58,6 +150,12 @@ class TestEcocashParser:
         parser = EcocashParser()
         assert parser.validate(str(txt_file)) is True
 
+    def test_validate_keywords_ignore_case_and_encoding(self):
+        """Test keyword validation on uppercase, non-ASCII text."""
+        head = "Zvakagamuchirwa — TRANSFERRED $5 to Tinotenda\n".encode()
+
+        assert EcocashParser().validate_bytes(head, "sms.txt") is True
+
     def test_validate_rejects_unrelated_content(self, tmp_path):
         """Test validation rejects unrelated files."""
         txt_file = tmp_path / "random.txt"
@@ -0,0 +1,276 @@
+"""Unit tests for the reconciliation engine."""
+
+from dataclasses import replace
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from src.models.transaction import NormalizedTransaction
+from src.reconciliation import engine as engine_module
+from src.reconciliation.engine import (
+    ReconciliationEngine,
+    TextScoreCache,
+    _CandidateIndex,
+)
+from src.reconciliation.matchers import AmountMatcher, DateMatcher
+from src.reconciliation.scorer import ConfidenceScorer
+
+
+def make_txn(txn_id: str, amount: str, day: int) -> NormalizedTransaction:
+    return NormalizedTransaction(
+        id=txn_id,
+        transaction_date=date(2024, 1, 1) + timedelta(days=day),
+        amount=Decimal(amount),
+        reference="",
+        description="",
+        source="bank",
+    )
+
+
+class TestCandidateIndex:
+    """Tests for the stage 2 candidate filter."""
+
+    def test_candidates_cover_every_nonzero_amount_or_date_score(self):
+        """Test that no pair with an amount or date score is filtered out."""
+        amounts = ["0", "0.01", "10.00", "10.50", "11.00", "-10.00", "250.00"]
+        sources = [
+            make_txn(f"s{i}", amount, day)
+            for i, amount in enumerate(amounts)
+            for day in (0, 5)
+        ]
+        targets = [
+            make_txn(f"t{i}", amount, day)
+            for i, amount in enumerate(amounts)
+            for day in (0, 2, 4, 9)
+        ]
+        amount_matcher = AmountMatcher()
+        date_matcher = DateMatcher()
+
+        index = _CandidateIndex(targets, amount_matcher, date_matcher)
+
+        for source, positions in zip(sources, index.candidates(sources), strict=True):
+            for pos, target in enumerate(targets):
+                if (
+                    amount_matcher.score(source, target) > 0
+                    or date_matcher.score(source, target) > 0
+                ):
+                    assert pos in positions
+
+    def test_reference_ids_match_reference_bonus(self):
+        """Test that the reference index agrees with per-pair reference bonuses."""
+        refs = ["INV-1", "inv-1 ", "INV-2", "", "INV-1"]
+        targets = [
+            replace(make_txn(f"t{i}", "10.00", 0), reference=ref)
+            for i, ref in enumerate(refs)
+        ]
+        scorer = ConfidenceScorer()
+        index = _CandidateIndex(targets, scorer.amount_matcher, scorer.date_matcher)
+
+        for ref in ("inv-1", "INV-2", "", "INV-3"):
+            source = replace(make_txn("s", "10.00", 0), reference=ref)
+            expected = [scorer.reference_bonus(source, t) > 0 for t in targets]
+            same = index.ref_ids == index.reference_ids([source])[0]
+            assert same.tolist() == expected
+
+
+class TestExactReferenceMatching:
+    """Tests for stage 1 reference matching."""
+
+    def test_duplicate_source_reference_claims_target_once(self):
+        """Test that two sources sharing a reference can't both take one target."""
+        sources = [
+            replace(make_txn(f"s{i}", "100.00", 0), reference="INV-1") for i in range(2)
+        ]
+        target = replace(make_txn("t", "100.00", 0), reference="inv-1")
+
+        matches, summary = ReconciliationEngine().reconcile(sources, [target])
+
+        exact = [m for m in matches if m.matched_by == "exact_reference"]
+        assert [m.source_transaction.id for m in exact] == ["s0"]
+        assert summary.matched_count == 1
+
+    def test_reference_match_ignores_surrounding_whitespace(self):
+        """Test that references are compared stripped, as the scorer bonus is."""
+        source = replace(make_txn("s", "100.00", 0), reference="TXN001 ")
+        target = replace(make_txn("t", "100.00", 0), reference=" txn001")
+
+        matches, _ = ReconciliationEngine().reconcile([source], [target])
+
+        assert [m.matched_by for m in matches] == ["exact_reference"]
+
+    def test_blank_references_never_match_exactly(self):
+        """Test that whitespace-only references are treated as missing."""
+        source = replace(make_txn("s", "100.00", 0), reference="  ")
+        target = replace(make_txn("t", "100.00", 0), reference="  ")
+
+        matches, _ = ReconciliationEngine().reconcile([source], [target])
+
+        assert "exact_reference" not in [m.matched_by for m in matches]
+
+
+class TestFuzzyAssignment:
+    """Tests for stage 2/3 assignment order."""
+
+    def test_contested_target_goes_to_best_pair(self):
+        """Test that a later source with a better score wins a contested target."""
+        target = replace(make_txn("t", "100.00", 0), description="Acme rent")
+        runner_up = replace(make_txn("t2", "100.00", 3), description="Acme")
+        weaker = replace(make_txn("s1", "100.00", 1), description="Acme rent")
+        stronger = replace(make_txn("s2", "100.00", 0), description="Acme rent")
+
+        matches, _ = ReconciliationEngine(confidence_threshold=0.75).reconcile(
+            [weaker, stronger], [target, runner_up]
+        )
+
+        assert [
+            (m.source_transaction.id, m.target_transaction.id) for m in matches
+        ] == [
+            ("s1", "t2"),
+            ("s2", "t"),
+        ]
+
+    def test_skips_text_scoring_when_threshold_unreachable(self):
+        """Test that pairs unable to reach review are never text-scored."""
+        source = replace(make_txn("s", "100.00", 0), description="Rent")
+        near = replace(make_txn("near", "100.00", 1), description="Rent")
+        far = replace(make_txn("far", "900.00", 1), description="Rent")
+        cache = TextScoreCache()
+
+        ReconciliationEngine(text_cache=cache).reconcile([source], [near, far])
+
+        assert set(cache) == {("s", "near")}
+
+    def test_block_size_does_not_change_matches(self, monkeypatch):
+        """Test that scoring pairs in small blocks gives the same matches."""
+        sources = [
+            replace(make_txn(f"s{i}", f"{100 + i % 7}.00", i % 5), description="Rent")
+            for i in range(30)
+        ]
+        targets = [
+            replace(make_txn(f"t{i}", f"{100 + i % 9}.00", i % 4), description="Rent")
+            for i in range(30)
+        ]
+
+        def run() -> list[tuple]:
+            matches, _ = ReconciliationEngine().reconcile(sources, targets)
+            return [
+                (m.source_transaction.id, m.target_transaction.id, m.score)
+                for m in matches
+            ]
+
+        expected = run()
+        monkeypatch.setattr(engine_module, "_BLOCK_PAIRS", 5)
+
+        assert run() == expected
+
+    def test_date_window_days_widens_date_scoring(self):
+        """Test that the configured date window reaches the date matcher."""
+        source = replace(make_txn("s", "100.00", 0), description="Rent")
+        target = replace(make_txn("t", "100.00", 5), description="Rent")
+
+        default, _ = ReconciliationEngine().reconcile([source], [target])
+        wide, _ = ReconciliationEngine(date_window_days=7).reconcile([source], [target])
+
+        assert default[0].score.date_score == 0.0
+        assert wide[0].score.date_score == 1.0 - 5 / 8
+
+
+class TestParallelMatching:
+    """Tests for process-parallel fuzzy matching."""
+
+    def test_parallel_matches_serial(self):
+        """Test that n_jobs > 1 produces the same matches as in-process scoring."""
+        # Repeated amounts, dates and descriptions give ties and contention
+        sources = [
+            replace(
+                make_txn(f"s{i}", f"{100 + i % 15}.00", i % 10),
+                description=f"Payment {i % 4}",
+            )
+            for i in range(120)
+        ]
+        targets = [
+            replace(
+                make_txn(f"t{i}", f"{100 + i % 17}.00", i % 11),
+                description=f"Payment {i % 5}",
+            )
+            for i in range(120)
+        ]
+
+        def run(n_jobs: int) -> list[tuple]:
+            engine = ReconciliationEngine(confidence_threshold=0.8, n_jobs=n_jobs)
+            matches, _ = engine.reconcile(sources, targets)
+            return [
+                (m.source_transaction.id, m.target_transaction.id, m.status, m.score)
+                for m in matches
+            ]
+
+        assert run(2) == run(1)
+
+
+class TestTextCache:
+    """Tests for reusing text scores across runs."""
+
+    def test_rerun_with_shared_cache_matches_fresh_run(self):
+        """Test that cached text scores give the same result as a fresh engine."""
+        sources = [
+            replace(make_txn(f"s{i}", f"{100 + i}.00", i), description=f"Invoice {i}")
+            for i in range(10)
+        ]
+        targets = [
+            replace(make_txn(f"t{i}", f"{100 + i}.00", i), description=f"Inv {i}")
+            for i in range(10)
+        ]
+        cache = TextScoreCache()
+
+        ReconciliationEngine(text_cache=cache).reconcile(sources, targets)
+        assert cache
+
+        cached, _ = ReconciliationEngine(0.7, text_cache=cache).reconcile(
+            sources, targets
+        )
+        fresh, _ = ReconciliationEngine(0.7).reconcile(sources, targets)
+
+        assert [(m.target_transaction.id, m.status, m.score) for m in cached] == [
+            (m.target_transaction.id, m.status, m.score) for m in fresh
+        ]
+
+    def test_clear_cache(self):
+        """Test that clear_cache empties the shared cache."""
+        cache = TextScoreCache()
+        cache.update([(("s", "t"), 0.5)])
+
+        ReconciliationEngine(text_cache=cache).clear_cache()
+
+        assert len(cache) == 0
+
+    def test_cache_evicts_least_recently_used(self):
+        """Test that a full cache drops the pair read or written longest ago."""
+        cache = TextScoreCache(maxsize=2)
+        cache.update([(("s", "a"), 0.1), (("s", "b"), 0.2)])
+
+        cache.get_many([("s", "a")])
+        cache.update([(("s", "c"), 0.3)])
+
+        assert list(cache) == [("s", "a"), ("s", "c")]
+        assert np.isnan(cache.get_many([("s", "b")])[0])
+
+    def test_small_cache_matches_fresh_run(self):
+        """Test that evictions mid-run only cost recomputation."""
+        sources = [
+            replace(make_txn(f"s{i}", "100.00", i % 3), description=f"Rent {i}")
+            for i in range(10)
+        ]
+        targets = [
+            replace(make_txn(f"t{i}", "100.00", i % 3), description=f"Rent {i}")
+            for i in range(10)
+        ]
+        cache = TextScoreCache(maxsize=3)
+
+        bounded, _ = ReconciliationEngine(text_cache=cache).reconcile(sources, targets)
+        fresh, _ = ReconciliationEngine().reconcile(sources, targets)
+
+        assert len(cache) == 3
+        assert [(m.target_transaction.id, m.score) for m in bounded] == [
+            (m.target_transaction.id, m.score) for m in fresh
+        ]
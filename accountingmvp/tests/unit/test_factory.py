@@ -1,7 +1,6 @@
 """Tests for parser factory."""
 
-import tempfile
-from pathlib import Path
+import io
 
 import pytest
 
@@ -14,77 +13,87 @@ from src.parsers.zipit import ZIPITParser
 class TestParserFactory:
     """Test ParserFactory class."""
 
-    def test_get_parser_bank_csv(self):
+    def test_get_parser_bank_csv(self, tmp_path):
         """Test getting parser for bank CSV file."""
         content = """Date,Reference,Amount,Description
 2024-01-15,TXN001,1500.00,Payment from ABC Corp
 """
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
-        ) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            parser = ParserFactory.get_parser(temp_path)
-            assert parser is not None
-            assert isinstance(parser, BankCSVParser)
-        finally:
-            Path(temp_path).unlink()
-
-    def test_get_parser_ecocash(self):
+        file_path = tmp_path / "statement.csv"
+        file_path.write_text(content)
+
+        parser = ParserFactory.get_parser(str(file_path))
+        assert parser is not None
+        assert isinstance(parser, BankCSVParser)
+
+    def test_get_parser_ecocash(self, tmp_path):
         """Test getting parser for Ecocash file."""
         content = """You have received $1500.00 from ABC Corp
 Ref: EC001
 Date: 15/01/2024
 """
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", delete=False
-        ) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            parser = ParserFactory.get_parser(temp_path)
-            assert parser is not None
-            assert isinstance(parser, EcocashParser)
-        finally:
-            Path(temp_path).unlink()
-
-    def test_get_parser_zipit(self):
+        file_path = tmp_path / "statement.txt"
+        file_path.write_text(content)
+
+        parser = ParserFactory.get_parser(str(file_path))
+        assert parser is not None
+        assert isinstance(parser, EcocashParser)
+
+    def test_get_parser_zipit(self, tmp_path):
         """Test getting parser for ZIPIT file."""
         content = """15/01/2024 | ZIP001 | 1500.00 | Payment from ABC Corp
 16/01/2024 | ZIP002 | 250.50 | Transfer to XYZ Ltd
 """
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", delete=False
-        ) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            parser = ParserFactory.get_parser(temp_path)
-            assert parser is not None
-            assert isinstance(parser, ZIPITParser)
-        finally:
-            Path(temp_path).unlink()
-
-    def test_get_parser_unknown_format(self):
+        file_path = tmp_path / "statement.txt"
+        file_path.write_text(content)
+
+        parser = ParserFactory.get_parser(str(file_path))
+        assert parser is not None
+        assert isinstance(parser, ZIPITParser)
+
+    def test_get_parser_from_buffer(self):
+        """Test format detection on an in-memory buffer."""
+        buffer = io.BytesIO(
+            b"15/01/2024 | ZIP001 | 1500.00 | Payment from ABC Corp\n"
+            b"16/01/2024 | ZIP002 | 250.50 | Transfer to XYZ Ltd\n"
+        )
+        buffer.name = "upload.txt"
+
+        parser = ParserFactory.get_parser(buffer)
+        assert isinstance(parser, ZIPITParser)
+        assert len(parser.parse(buffer)) == 2
+
+    def test_get_parser_reuses_instances(self):
+        """Test that detection hands out shared parser instances."""
+        buffer = io.BytesIO(b"Date,Reference,Amount,Description\n")
+        buffer.name = "statement.csv"
+
+        parser = ParserFactory.get_parser(buffer)
+
+        assert parser is ParserFactory.get_parser(buffer)
+        assert parser is ParserFactory.get_parser_by_type("bank")
+
+    def test_get_parser_mislabeled_extension(self):
+        """Test that a file whose extension points elsewhere is still detected."""
+        buffer = io.BytesIO(
+            b"Date,Reference,Amount,Description\n"
+            b"2024-01-15,TXN001,1500.00,Payment\n"
+        )
+        buffer.name = "statement.txt"
+
+        parser = ParserFactory.get_parser(buffer)
+
+        assert isinstance(parser, BankCSVParser)
+
+    def test_get_parser_unknown_format(self, tmp_path):
         """Test getting parser for unknown format."""
         content = """This is some random content
 that doesn't match any known format
 """
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", delete=False
-        ) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            parser = ParserFactory.get_parser(temp_path)
-            assert parser is None
-        finally:
-            Path(temp_path).unlink()
+        file_path = tmp_path / "statement.txt"
+        file_path.write_text(content)
+
+        parser = ParserFactory.get_parser(str(file_path))
+        assert parser is None
 
     def test_get_parser_nonexistent_file(self):
         """Test getting parser for nonexistent file."""
@@ -121,39 +130,27 @@ that doesn't match any known format
         assert isinstance(parser2, BankCSVParser)
         assert isinstance(parser3, BankCSVParser)
 
-    def test_parser_priority_ecocash_over_zipit(self):
+    def test_parser_priority_ecocash_over_zipit(self, tmp_path):
         """Test that Ecocash parser is tried before ZIPIT."""
         # Content that could match multiple parsers
         content = """You have received $1500.00
 15/01/2024 | ZIP001 | 1500.00 | Payment
 """
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", delete=False
-        ) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            parser = ParserFactory.get_parser(temp_path)
-            # Should prefer Ecocash if it validates
-            assert parser is not None
-        finally:
-            Path(temp_path).unlink()
-
-    def test_csv_extension_uses_bank_parser(self):
+        file_path = tmp_path / "statement.txt"
+        file_path.write_text(content)
+
+        parser = ParserFactory.get_parser(str(file_path))
+        # Should prefer Ecocash if it validates
+        assert parser is not None
+
+    def test_csv_extension_uses_bank_parser(self, tmp_path):
         """Test that .csv files use bank parser."""
         content = """Some,CSV,Content
 1,2,3
 """
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".csv", delete=False
-        ) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            parser = ParserFactory.get_parser(temp_path)
-            # CSV files should try bank parser first
-            assert parser is not None or parser is None  # Depends on validation
-        finally:
-            Path(temp_path).unlink()
+        file_path = tmp_path / "statement.csv"
+        file_path.write_text(content)
+
+        parser = ParserFactory.get_parser(str(file_path))
+        # CSV files should try bank parser first
+        assert parser is not None or parser is None  # Depends on validation
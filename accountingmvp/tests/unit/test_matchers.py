@@ -1,235 +1,231 @@
 """Unit tests for matchers."""
 
-from datetime import date
+from dataclasses import replace
+from datetime import date, timedelta
 from decimal import Decimal
 
+import numpy as np
+import pytest
+
 from src.models.transaction import NormalizedTransaction
 from src.reconciliation.matchers import AmountMatcher, DateMatcher, FuzzyTextMatcher
 
+# Template transaction; tests copy it with only the fields under test changed
+BASE_TXN = NormalizedTransaction(
+    id="1",
+    transaction_date=date(2024, 1, 15),
+    amount=Decimal("100"),
+    reference="REF1",
+    description="Test",
+    source="bank",
+)
 
-class TestFuzzyTextMatcher:
-    """Tests for FuzzyTextMatcher."""
 
-    def test_exact_match_returns_high_score(self):
-        """Test that exact text returns high score."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("100"),
-            reference="REF1",
-            description="Payment from ABC Corp",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("100"),
-            reference="REF2",
-            description="Payment from ABC Corp",
-            source="ecocash",
-        )
+def make_txn(**changes) -> NormalizedTransaction:
+    """Copy BASE_TXN with the given fields replaced."""
+    return replace(BASE_TXN, **changes)
 
-        matcher = FuzzyTextMatcher()
-        score = matcher.score(t1, t2)
 
-        assert score >= 0.95
+@pytest.fixture(scope="module")
+def text_matcher():
+    """Shared text matcher; matchers hold only their configuration."""
+    return FuzzyTextMatcher()
 
-    def test_similar_text_returns_good_score(self):
-        """Test similar text matching."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("100"),
-            reference="REF1",
-            description="Payment from ABC Corporation",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("100"),
-            reference="REF2",
-            description="ABC Corp payment received",
-            source="ecocash",
-        )
 
-        matcher = FuzzyTextMatcher()
-        score = matcher.score(t1, t2)
+@pytest.fixture(scope="module")
+def amount_matcher():
+    """Shared amount matcher with default tolerances."""
+    return AmountMatcher()
 
-        assert score >= 0.5
 
-    def test_different_text_returns_low_score(self):
-        """Test completely different text."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("100"),
-            reference="REF1",
-            description="Invoice from ABC Corporation",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("100"),
-            reference="REF2",
-            description="Monthly rent XYZ apartments",
-            source="ecocash",
-        )
+@pytest.fixture(scope="module")
+def date_matcher():
+    """Shared date matcher with the default window."""
+    return DateMatcher()
+
 
-        matcher = FuzzyTextMatcher()
-        score = matcher.score(t1, t2)
+class TestFuzzyTextMatcher:
+    """Tests for FuzzyTextMatcher."""
 
-        assert score < 0.7  # Adjusted threshold for fuzzy matching
+    @pytest.mark.parametrize(
+        ("desc1", "desc2", "low", "high"),
+        [
+            ("Payment from ABC Corp", "Payment from ABC Corp", 0.95, 1.0),
+            ("Payment from ABC Corporation", "ABC Corp payment received", 0.5, 1.0),
+            # Loose bound: fuzzy algorithms still find some shared characters
+            ("Invoice from ABC Corporation", "Monthly rent XYZ apartments", 0.0, 0.69),
+        ],
+        ids=["exact", "similar", "different"],
+    )
+    def test_text_score_bounds(self, text_matcher, desc1, desc2, low, high):
+        """Test exact, similar and unrelated descriptions."""
+        t1 = make_txn(description=desc1, reference="REF1")
+        t2 = make_txn(id="2", description=desc2, reference="REF2", source="ecocash")
+
+        assert low <= text_matcher.score(t1, t2) <= high
+
+    def test_score_many_matches_score_normalized(self, text_matcher):
+        """Test that batched text scoring equals per-pair scoring."""
+        fields = [
+            ("payment from abc corp", "txn001"),
+            ("abc corp payment", "txn001"),
+            ("transfer", None),
+            (None, "txn002"),
+            ("", "txn 001"),
+            (None, None),
+        ]
+        descs = [desc for desc, _ in fields]
+        refs = [ref for _, ref in fields]
+
+        for desc, ref in fields:
+            expected = [
+                text_matcher.score_normalized(desc, ref, other_desc, other_ref)
+                for other_desc, other_ref in fields
+            ]
+            assert text_matcher.score_many(desc, ref, descs, refs).tolist() == expected
+
+    def test_score_matrix_matches_score(self, text_matcher):
+        """Test that the N x M matrix equals pointwise scoring."""
+        fields = [
+            ("Payment from ABC Corp", "TXN001"),
+            ("ABC Corp payment", "txn 001"),
+            ("ABC Corp payment", ""),
+            ("", "TXN002"),
+            ("  ", "TXN001"),
+        ]
+        txns = [make_txn(description=d, reference=r) for d, r in fields]
+
+        matrix = text_matcher.score_matrix(txns[:3], txns)
+
+        assert matrix.shape == (3, 5)
+        assert matrix.tolist() == [
+            [text_matcher.score(s, t) for t in txns] for s in txns[:3]
+        ]
+
+    def test_best_match_cutoff_keeps_best_score(self, text_matcher):
+        """Test that early cutoffs return the best of all algorithms."""
+        pairs = [
+            ("abc", "payment from abc corp"),
+            ("corp abc payment", "payment from abc corp"),
+            ("abc", "abc"),
+            ("xyz", "payment"),
+        ]
+
+        for s1, s2 in pairs:
+            expected = max(scorer(s1, s2) / 100 for scorer in text_matcher.SCORERS)
+            assert text_matcher._best_match(s1, s2) == expected
+
+    def test_best_match_is_order_independent(self, text_matcher):
+        """Test that swapping the arguments gives the same score."""
+        forward = text_matcher._best_match("abc corp payment", "payment from abc")
+        backward = text_matcher._best_match("payment from abc", "abc corp payment")
+
+        assert forward == backward
 
 
 class TestAmountMatcher:
     """Tests for AmountMatcher."""
 
-    def test_exact_amount_returns_perfect_score(self):
-        """Test exact amount match."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("1500.00"),
-            reference="REF1",
-            description="Test",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("1500.00"),
-            reference="REF2",
-            description="Test",
-            source="ecocash",
-        )
-
-        matcher = AmountMatcher()
-        score = matcher.score(t1, t2)
-
-        assert score == 1.0
-
-    def test_within_tolerance_returns_high_score(self):
-        """Test amount within 2% tolerance."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("1500.00"),
-            reference="REF1",
-            description="Test",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("1510.00"),
-            reference="REF2",
-            description="Test",
-            source="ecocash",
-        )
-
-        matcher = AmountMatcher()
-        score = matcher.score(t1, t2)
-
-        assert score >= 0.9
-
-    def test_different_amount_returns_low_score(self):
-        """Test very different amounts."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("1500.00"),
-            reference="REF1",
-            description="Test",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 1),
-            amount=Decimal("500.00"),
-            reference="REF2",
-            description="Test",
-            source="ecocash",
-        )
-
-        matcher = AmountMatcher()
-        score = matcher.score(t1, t2)
-
-        assert score == 0.0
+    @pytest.mark.parametrize(
+        ("amount1", "amount2", "low", "high"),
+        [
+            ("1500.00", "1500.00", 1.0, 1.0),
+            ("1500.00", "1510.00", 0.9, 1.0),  # within 2% tolerance
+            ("1500.00", "500.00", 0.0, 0.0),
+        ],
+        ids=["exact", "within_tolerance", "different"],
+    )
+    def test_amount_score_bounds(self, amount_matcher, amount1, amount2, low, high):
+        """Test exact, close and very different amounts."""
+        t1 = make_txn(amount=Decimal(amount1))
+        t2 = make_txn(id="2", amount=Decimal(amount2), source="ecocash")
+
+        assert low <= amount_matcher.score(t1, t2) <= high
+
+    def test_amount_range_covers_every_nonzero_score(self, amount_matcher):
+        """Test that amounts scoring above zero lie inside get_amount_range."""
+
+        def txn(amount: str) -> NormalizedTransaction:
+            return make_txn(id=amount, amount=Decimal(amount))
+
+        for base in ("0", "0.01", "1.00", "99.99", "1500.00", "-250.50"):
+            source = txn(base)
+            low, high = amount_matcher.get_amount_range(source)
+            for cents in range(0, 200000, 31):
+                target = txn(str(Decimal(cents) / 100))
+                if amount_matcher.score(source, target) > 0:
+                    assert low <= cents <= high
+
+    def test_score_arrays_matches_score(self):
+        """Test that vectorized scoring equals scalar scoring element-wise."""
+
+        def txn(amount: str) -> NormalizedTransaction:
+            return make_txn(id=amount, amount=Decimal(amount))
+
+        amounts = ["0", "0.01", "0.02", "1.00", "98.00", "99.99", "100", "-105.50"]
+        targets = [txn(amount) for amount in amounts]
+        cents = np.array([t.amount_cents for t in targets], dtype=np.int64)
+
+        for matcher in (AmountMatcher(), AmountMatcher(percentage_tolerance=0.0)):
+            for source in targets:
+                expected = [matcher.score(source, target) for target in targets]
+                scores = matcher.score_arrays(np.int64(source.amount_cents), cents)
+                assert scores.tolist() == expected
+
+    def test_score_matrix_matches_score(self, amount_matcher):
+        """Test that the N x M matrix equals pointwise scoring."""
+        sources = [make_txn(amount=Decimal(a)) for a in ("0", "100", "-98.50")]
+        targets = [make_txn(amount=Decimal(a)) for a in ("100", "99", "0", "250")]
+
+        matrix = amount_matcher.score_matrix(sources, targets)
+
+        assert matrix.shape == (3, 4)
+        assert matrix.tolist() == [
+            [amount_matcher.score(s, t) for t in targets] for s in sources
+        ]
 
 
 class TestDateMatcher:
     """Tests for DateMatcher."""
 
-    def test_same_date_returns_perfect_score(self):
-        """Test same date match."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 15),
-            amount=Decimal("100"),
-            reference="REF1",
-            description="Test",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 15),
-            amount=Decimal("100"),
-            reference="REF2",
-            description="Test",
-            source="ecocash",
-        )
-
-        matcher = DateMatcher()
-        score = matcher.score(t1, t2)
-
-        assert score == 1.0
-
-    def test_within_window_returns_good_score(self):
-        """Test dates within 3-day window."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 15),
-            amount=Decimal("100"),
-            reference="REF1",
-            description="Test",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 17),
-            amount=Decimal("100"),
-            reference="REF2",
-            description="Test",
-            source="ecocash",
-        )
-
-        matcher = DateMatcher()
-        score = matcher.score(t1, t2)
-
-        assert 0 < score < 1.0
-
-    def test_outside_window_returns_zero(self):
-        """Test dates outside window."""
-        t1 = NormalizedTransaction(
-            id="1",
-            transaction_date=date(2024, 1, 15),
-            amount=Decimal("100"),
-            reference="REF1",
-            description="Test",
-            source="bank",
-        )
-        t2 = NormalizedTransaction(
-            id="2",
-            transaction_date=date(2024, 1, 25),
-            amount=Decimal("100"),
-            reference="REF2",
-            description="Test",
-            source="ecocash",
-        )
-
-        matcher = DateMatcher()
-        score = matcher.score(t1, t2)
-
-        assert score == 0.0
+    @pytest.mark.parametrize(
+        ("day1", "day2", "low", "high"),
+        [
+            (15, 15, 1.0, 1.0),
+            (15, 17, 0.1, 0.9),  # within 3-day window
+            (15, 25, 0.0, 0.0),
+        ],
+        ids=["same_date", "within_window", "outside_window"],
+    )
+    def test_date_score_bounds(self, date_matcher, day1, day2, low, high):
+        """Test same, nearby and distant dates."""
+        t1 = make_txn(transaction_date=date(2024, 1, day1))
+        t2 = make_txn(id="2", transaction_date=date(2024, 1, day2), source="ecocash")
+
+        assert low <= date_matcher.score(t1, t2) <= high
+
+    def test_score_arrays_matches_score(self, date_matcher):
+        """Test that vectorized scoring equals scalar scoring element-wise."""
+        source = BASE_TXN
+        days = [date(2024, 1, 15) + timedelta(days=n) for n in range(-5, 6)]
+        targets = [replace(source, transaction_date=d) for d in days]
+        ordinals = np.array([d.toordinal() for d in days], dtype=np.int64)
+
+        expected = [date_matcher.score(source, target) for target in targets]
+        scores = date_matcher.score_arrays(
+            np.int64(source.transaction_date.toordinal()), ordinals
+        )
+
+        assert scores.tolist() == expected
+
+    def test_score_matrix_matches_score(self, date_matcher):
+        """Test that the N x M matrix equals pointwise scoring."""
+        sources = [make_txn(transaction_date=date(2024, 1, d)) for d in (1, 15)]
+        targets = [make_txn(transaction_date=date(2024, 1, d)) for d in (1, 3, 14, 30)]
+
+        matrix = date_matcher.score_matrix(sources, targets)
+
+        assert matrix.shape == (2, 4)
+        assert matrix.tolist() == [
+            [date_matcher.score(s, t) for t in targets] for s in sources
+        ]
@@ -0,0 +1,34 @@
+"""Unit tests for match models."""
+
+import pytest
+
+from src.models.enums import MatchConfidence
+from src.models.match import MatchScore
+
+
+class TestMatchScore:
+    """Tests for MatchScore derived values."""
+
+    def test_total_and_confidence(self):
+        """Test the weighted total and its confidence band."""
+        score = MatchScore(
+            amount_score=1.0, text_score=0.5, date_score=1.0, reference_bonus=0.0
+        )
+
+        assert score.total_score == pytest.approx(0.75)
+        assert score.confidence == MatchConfidence.MEDIUM
+
+    def test_model_copy_recomputes_derived_values(self):
+        """Test that model_copy(update=...) doesn't keep the original's total."""
+        score = MatchScore(
+            amount_score=1.0, text_score=0.5, date_score=1.0, reference_bonus=0.0
+        )
+
+        updated = score.model_copy(update={"text_score": 1.0})
+
+        assert updated.total_score == pytest.approx(0.9)
+        assert score.model_copy(update={"amount_score": 0.0}).confidence == (
+            MatchConfidence.NONE
+        )
+        assert score.total_score == pytest.approx(0.75)
+        assert score.model_copy().total_score == score.total_score
@@ -1,8 +1,12 @@
 """Unit tests for normalization pipeline."""
 
+from dataclasses import FrozenInstanceError
 from datetime import date
 from decimal import Decimal
 
+import pandas as pd
+import pytest
+
 from src.models.enums import TransactionSource
 from src.models.transaction import NormalizedTransaction, RawTransaction
 from src.normalizer import DataValidator, NormalizationPipeline
@@ -30,44 +34,122 @@ class TestNormalizationPipeline:
         assert result[0].transaction_date == date(2024, 1, 15)
         assert result[0].amount == Decimal("1500.00")
         assert result[0].reference == "TXN001"
-
-    def test_handles_various_date_formats(self):
+        assert result[0].source == "bank_statement"
+        assert type(result[0].source) is str
+
+    @pytest.mark.parametrize(
+        ("raw_date", "expected"),
+        [
+            ("15/01/2024", date(2024, 1, 15)),
+            ("2024-01-16", date(2024, 1, 16)),
+            ("17 Jan 2024", date(2024, 1, 17)),
+            ("18-01-2024", date(2024, 1, 18)),
+            ("2024/01/19", date(2024, 1, 19)),
+            ("20 January 2024", date(2024, 1, 20)),
+        ],
+    )
+    def test_handles_various_date_formats(self, raw_date, expected):
         """Test parsing of various date formats."""
         pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
 
+        raw = RawTransaction(
+            raw_date=raw_date,
+            raw_amount="100",
+            raw_reference="R1",
+            description="Test",
+            source_file="test.csv",
+            line_number=1,
+        )
+
+        (txn,) = pipeline.process([raw])
+
+        assert txn.transaction_date == expected
+
+    def test_handles_mixed_date_formats_in_one_batch(self):
+        """Test that each row of a mixed batch is parsed by its own format."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        parsed = pipeline._parse_dates(
+            pd.Series(["15/01/2024", "2024-01-16", "17 Jan 2024", "not-a-date"])
+        )
+
+        assert parsed.dt.date.tolist()[:3] == [
+            date(2024, 1, 15),
+            date(2024, 1, 16),
+            date(2024, 1, 17),
+        ]
+        assert pd.isna(parsed.iloc[3])
+
+    def test_parses_repeated_and_missing_dates(self):
+        """Test that repeated strings share a parse and missing ones become NaT."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+        dates = pd.Series(["17 Jan 2024", None, " 17 Jan 2024", "2024-01-16"])
+        dates.index = [10, 11, 12, 13]
+
+        parsed = pipeline._parse_dates(dates)
+
+        assert parsed.index.tolist() == [10, 11, 12, 13]
+        assert parsed[[10, 12, 13]].dt.date.tolist() == [
+            date(2024, 1, 17),
+            date(2024, 1, 17),
+            date(2024, 1, 16),
+        ]
+        assert pd.isna(parsed[11])
+
+    @pytest.mark.parametrize(
+        ("raw_date", "expected"),
+        [
+            ("2024-01-15T10:00:00Z", date(2024, 1, 15)),
+            ("2024-01-15T10:00:00+02:00", date(2024, 1, 15)),
+            ("2024-01-15T23:30:00-05:00", date(2024, 1, 15)),
+        ],
+    )
+    def test_keeps_wall_clock_date_of_timezone_aware_dates(self, raw_date, expected):
+        """Test that dates with a UTC offset keep the date as written."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        parsed = pipeline._parse_dates(pd.Series([raw_date, raw_date]))
+
+        assert parsed.dt.date.tolist() == [expected, expected]
+
+    @pytest.mark.parametrize(
+        "raw_dates",
+        [
+            ["2024-01-15T10:00:00+02:00", "2024-01-16T10:00:00+03:00"],
+            ["2024-01-15T10:00:00Z", "2024-01-16 09:00"],
+            ["2024-01-15T10:00:00+02:00", "2024-01-16 09:00", "garbage"],
+        ],
+    )
+    def test_mixed_offsets_do_not_fail_the_batch(self, raw_dates):
+        """Test that mixed offsets and naive dates are parsed row by row."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
         raw_transactions = [
             RawTransaction(
-                raw_date="15/01/2024",
+                raw_date=raw_date,
                 raw_amount="100",
-                raw_reference="R1",
-                description="Test",
-                source_file="test.csv",
-                line_number=1,
-            ),
-            RawTransaction(
-                raw_date="2024-01-16",
-                raw_amount="200",
-                raw_reference="R2",
+                raw_reference=f"R{i}",
                 description="Test",
                 source_file="test.csv",
-                line_number=2,
-            ),
-            RawTransaction(
-                raw_date="17 Jan 2024",
-                raw_amount="300",
-                raw_reference="R3",
-                description="Test",
-                source_file="test.csv",
-                line_number=3,
-            ),
+                line_number=i,
+            )
+            for i, raw_date in enumerate(raw_dates)
         ]
 
         result = pipeline.process(raw_transactions)
 
-        assert len(result) == 3
-        assert result[0].transaction_date == date(2024, 1, 15)
-        assert result[1].transaction_date == date(2024, 1, 16)
-        assert result[2].transaction_date == date(2024, 1, 17)
+        assert [t.transaction_date for t in result] == [
+            date(2024, 1, 15),
+            date(2024, 1, 16),
+        ]
+
+    def test_remembers_month_name_date_format(self):
+        """Test that "17 Jan 2024" dates are parsed by the exact format table."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        parsed = pipeline._parse_dates(pd.Series(["17 Jan 2024", "3 feb 2024"]))
+
+        assert parsed.dt.date.tolist() == [date(2024, 1, 17), date(2024, 2, 3)]
+        assert pipeline._preferred_date_format == "%d %b %Y"
 
     def test_handles_amount_formats(self):
         """Test parsing of various amount formats."""
@@ -97,6 +179,100 @@ class TestNormalizationPipeline:
         assert len(result) == 2
         assert result[0].amount == Decimal("1500.00")
         assert result[1].amount == Decimal("-500.00")
+        assert result[0].amount_cents == 150000
+        assert result[1].amount_cents == -50000
+
+    @pytest.mark.parametrize(
+        ("raw_amount", "expected"),
+        [
+            ("1e5", Decimal("100000")),
+            ("1E+5", Decimal("100000")),
+            ("(2.5e2)", Decimal("-250")),
+            ("1e", None),
+            ("12abc", None),
+        ],
+    )
+    def test_amount_acceptance(self, raw_amount, expected):
+        """Test which amount strings are kept, matching Decimal() parsing."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        raw = RawTransaction(
+            raw_date="2024-01-15",
+            raw_amount=raw_amount,
+            raw_reference="R1",
+            description="Test",
+            source_file="test.csv",
+            line_number=1,
+        )
+
+        result = pipeline.process([raw])
+
+        assert [t.amount for t in result] == ([] if expected is None else [expected])
+
+    @pytest.mark.parametrize(
+        ("raw_date", "expected"),
+        [
+            # ISO dates are year-month-day, although inference reads dayfirst
+            ("2024-05-01", date(2024, 5, 1)),
+            ("2024/05/01", date(2024, 5, 1)),
+            ("01/05/2024", date(2024, 5, 1)),
+            ("01-05-2024", date(2024, 5, 1)),
+        ],
+    )
+    def test_ambiguous_dates_follow_the_format_table(self, raw_date, expected):
+        """Test that ambiguous day/month dates resolve as the format table says."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        parsed = pipeline._parse_dates(pd.Series([raw_date]))
+
+        assert parsed.dt.date.tolist() == [expected]
+
+    def test_precomputes_match_keys(self):
+        """Test that text keys for matching are derived once per transaction."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        raw = RawTransaction(
+            raw_date="2024-01-15",
+            raw_amount="100",
+            raw_reference="txn001",
+            description="  Payment From ABC  ",
+            source_file="test.csv",
+            line_number=1,
+        )
+
+        (txn,) = pipeline.process([raw])
+
+        assert txn.match_description == "payment from abc"
+        assert txn.match_reference == "txn001"
+        assert txn.reference_key == "TXN001"
+
+    def test_match_keys_are_interned(self):
+        """Test that recurring descriptors share one string object."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        raw_transactions = [
+            RawTransaction(
+                raw_date="2024-01-15",
+                raw_amount=amount,
+                raw_reference="",
+                description="PAYMENT FROM ABC CORP",
+                source_file="test.csv",
+                line_number=i,
+            )
+            for i, amount in enumerate(["100", "200"])
+        ]
+
+        first, second = pipeline.process(raw_transactions)
+
+        assert first.match_description is second.match_description
+
+    def test_normalized_transactions_are_slotted(self, normalized_transaction):
+        """Test that matched records carry no per-instance __dict__."""
+        assert not hasattr(normalized_transaction, "__dict__")
+        assert "match_description" in NormalizedTransaction.__slots__
+
+        with pytest.raises(FrozenInstanceError):
+            normalized_transaction.amount = Decimal("1")
 
     def test_deduplicates_transactions(self):
         """Test that duplicate transactions are removed."""
@@ -116,6 +292,46 @@ class TestNormalizationPipeline:
 
         assert len(result) == 1
 
+    def test_deduplicates_across_batches(self):
+        """Test that a transaction seen in an earlier batch is skipped."""
+        pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
+
+        raw = RawTransaction(
+            raw_date="2024-01-15",
+            raw_amount="1000",
+            raw_reference="DUP",
+            description="Same transaction",
+            source_file="test.csv",
+            line_number=1,
+        )
+
+        first = pipeline.process([raw])
+        second = pipeline.process([raw])
+
+        assert len(first) == 1
+        assert len(first[0].id) == 16
+        assert second == []
+
+    def test_process_frame_matches_process(self):
+        """Test that a raw frame normalizes the same as raw transactions."""
+        raw = RawTransaction(
+            raw_date="2024-01-15",
+            raw_amount="$1,500.00",
+            raw_reference="txn 001",
+            description=" Payment ",
+            source_file="bank.csv",
+            line_number=2,
+        )
+
+        from_objects = NormalizationPipeline(TransactionSource.BANK_STATEMENT).process(
+            [raw]
+        )
+        from_frame = NormalizationPipeline(
+            TransactionSource.BANK_STATEMENT
+        ).process_frame(pd.DataFrame([raw.model_dump()]))
+
+        assert from_frame == from_objects
+
     def test_skips_invalid_dates(self):
         """Test that transactions with invalid dates are skipped."""
         pipeline = NormalizationPipeline(TransactionSource.BANK_STATEMENT)
@@ -210,3 +426,54 @@ class TestDataValidator:
         assert len(valid) == 1
         report = validator.get_report()
         assert report["total_warnings"] > 0
+
+    def test_validates_mixed_batch(self):
+        """Test that a batch is split into valid and invalid transactions."""
+        validator = DataValidator()
+
+        txns = [
+            NormalizedTransaction(
+                id=f"test{i}",
+                transaction_date=txn_date,
+                amount=Decimal(amount),
+                reference="REF001",
+                description="Payment",
+                source="bank_statement",
+            )
+            for i, (txn_date, amount) in enumerate(
+                [
+                    (date(2024, 1, 15), "100"),
+                    (date(1990, 1, 15), "100"),
+                    (date(2024, 1, 15), "1000000000.01"),
+                    (date(2024, 1, 15), "1000000000"),
+                ]
+            )
+        ]
+
+        valid, invalid = validator.validate_batch(txns)
+
+        assert [t.id for t in valid] == ["test0", "test3"]
+        assert [t.id for t in invalid] == ["test1", "test2"]
+        assert validator.get_report()["total_errors"] == 2
+
+    def test_caps_reported_diagnostics(self):
+        """Test that reported warnings are capped but still fully counted."""
+        validator = DataValidator()
+
+        txns = [
+            NormalizedTransaction(
+                id=f"test{i}",
+                transaction_date=date(2024, 1, 15),
+                amount=Decimal("0"),
+                reference="REF001",
+                description="Zero amount",
+                source="bank_statement",
+            )
+            for i in range(DataValidator.MAX_DIAG + 10)
+        ]
+
+        validator.validate_batch(txns)
+        report = validator.get_report()
+
+        assert report["total_warnings"] == DataValidator.MAX_DIAG + 10
+        assert len(report["warnings"]) == DataValidator.MAX_DIAG
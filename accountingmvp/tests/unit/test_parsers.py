@@ -1,31 +1,34 @@
 """Unit tests for CSV parsers."""
 
-from src.parsers import BankCSVParser, safe_filename, sanitize_csv_value
+import io
 
+import pandas as pd
+import pytest
 
-class TestSanitizer:
-    """Tests for CSV sanitization functions."""
+from src.parsers import (
+    BankCSVParser,
+    safe_filename,
+    sanitize_csv_series,
+    sanitize_csv_value,
+)
+from src.parsers.base import read_head
 
-    def test_sanitize_removes_formula_prefix_equals(self):
-        """Test that = prefix is neutralized."""
-        result = sanitize_csv_value("=SUM(A1:A10)")
-        assert result.startswith("'")
-        assert "=SUM" in result
 
-    def test_sanitize_removes_formula_prefix_plus(self):
-        """Test that + prefix is neutralized."""
-        result = sanitize_csv_value("+1234567890")
-        assert result.startswith("'")
+@pytest.fixture(scope="module")
+def bank_parser():
+    """Shared parser; BankCSVParser holds no per-file state."""
+    return BankCSVParser()
 
-    def test_sanitize_removes_formula_prefix_minus(self):
-        """Test that - prefix is neutralized."""
-        result = sanitize_csv_value("-@cmd")
-        assert result.startswith("'")
 
-    def test_sanitize_removes_formula_prefix_at(self):
-        """Test that @ prefix is neutralized."""
-        result = sanitize_csv_value("@SUM(A1)")
-        assert result.startswith("'")
+class TestSanitizer:
+    """Tests for CSV sanitization functions."""
+
+    @pytest.mark.parametrize(
+        "value", ["=SUM(A1:A10)", "+1234567890", "-@cmd", "@SUM(A1)"]
+    )
+    def test_sanitize_neutralizes_formula_prefix(self, value):
+        """Test that =, +, - and @ prefixes are quoted, keeping the text."""
+        assert sanitize_csv_value(value) == "'" + value
 
     def test_sanitize_preserves_normal_text(self):
         """Test that normal text is unchanged."""
@@ -37,6 +40,17 @@ class TestSanitizer:
         result = sanitize_csv_value("")
         assert result == ""
 
+    def test_sanitize_series_matches_scalar(self):
+        """Test that the vectorized sanitizer agrees with the scalar one."""
+        values = ["=SUM(A1)", "+123", " -@cmd", "@x", "Normal text", ""]
+        result = sanitize_csv_series(pd.Series(values))
+        assert result.tolist() == [sanitize_csv_value(v) for v in values]
+
+    def test_sanitize_series_handles_missing(self):
+        """Test that missing values become empty strings."""
+        result = sanitize_csv_series(pd.Series(["ok", None]))
+        assert result.tolist() == ["ok", ""]
+
     def test_safe_filename_removes_special_chars(self):
         """Test filename sanitization."""
         result = safe_filename("../../../etc/passwd")
@@ -53,37 +67,84 @@ class TestSanitizer:
 class TestBankCSVParser:
     """Tests for BankCSVParser."""
 
-    def test_validate_valid_csv(self, sample_bank_csv):
+    def test_validate_valid_csv(self, sample_bank_csv, bank_parser):
         """Test validation of valid bank CSV."""
-        parser = BankCSVParser()
-        assert parser.validate(sample_bank_csv) is True
+        assert bank_parser.validate(sample_bank_csv) is True
 
-    def test_validate_invalid_csv(self, tmp_path):
+    def test_validate_invalid_csv(self, bank_parser):
         """Test validation of CSV with missing columns."""
-        invalid_csv = tmp_path / "invalid.csv"
-        invalid_csv.write_text("WrongCol1,WrongCol2\nvalue1,value2\n")
+        head = b"WrongCol1,WrongCol2\nvalue1,value2\n"
+        assert bank_parser.validate(io.BytesIO(head)) is False
 
-        parser = BankCSVParser()
-        assert parser.validate(str(invalid_csv)) is False
-
-    def test_parse_returns_transactions(self, sample_bank_csv):
+    def test_parse_returns_transactions(self, sample_bank_csv, bank_parser):
         """Test parsing returns list of transactions."""
-        parser = BankCSVParser()
-        transactions = parser.parse(sample_bank_csv)
+        transactions = bank_parser.parse(sample_bank_csv)
 
         assert len(transactions) == 4
-        assert transactions[0].raw_amount == "1500.0"
+        assert transactions[0].raw_amount == "1500.00"
         assert transactions[0].raw_reference == "TXN001"
 
-    def test_parse_sanitizes_descriptions(self, tmp_path):
+    def test_parse_sanitizes_descriptions(self, bank_parser):
         """Test that malicious content is sanitized."""
-        malicious_csv = tmp_path / "malicious.csv"
-        malicious_csv.write_text(
-            "Date,Reference,Amount,Description\n" "2024-01-15,REF1,100,=CMD|calc.exe\n"
+        transactions = bank_parser.parse_string(
+            "Date,Reference,Amount,Description\n2024-01-15,REF1,100,=CMD|calc.exe\n"
         )
 
-        parser = BankCSVParser()
-        transactions = parser.parse(str(malicious_csv))
-
         # Should be prefixed with quote
         assert transactions[0].description.startswith("'")
+
+    def test_parse_from_buffer(self, sample_bank_csv_content, bank_parser):
+        """Test parsing from an in-memory buffer instead of a path."""
+        buffer = io.BytesIO(sample_bank_csv_content.encode())
+        buffer.name = "upload.csv"
+
+        assert bank_parser.validate(buffer) is True
+        transactions = bank_parser.parse(buffer)
+
+        assert len(transactions) == 4
+        assert transactions[0].source_file == "upload.csv"
+
+    def test_parse_string_matches_parse(self, sample_bank_csv_content, bank_parser):
+        """Test that in-memory text parses the same as a buffer."""
+        buffer = io.BytesIO(sample_bank_csv_content.encode())
+        buffer.name = "upload.csv"
+
+        from_text = bank_parser.parse_string(sample_bank_csv_content, "upload.csv")
+        assert from_text == bank_parser.parse(buffer)
+        assert bank_parser.parse_string(sample_bank_csv_content)[0].source_file == (
+            "<memory>"
+        )
+
+    def test_parse_keeps_empty_cells_as_empty_strings(self, bank_parser):
+        """Test that empty reference/description cells stay "" (not "nan")."""
+        (txn,) = bank_parser.parse_string(
+            "Date,Amount,Reference,Description\n2024-01-15,100.00,,\n"
+        )
+
+        assert txn.raw_reference == ""
+        assert txn.description == ""
+
+    def test_parse_frame_matches_parse(self, sample_bank_csv, bank_parser):
+        """Test that the columnar parse path agrees with parse()."""
+        df = bank_parser.parse_frame(sample_bank_csv)
+        transactions = bank_parser.parse(sample_bank_csv)
+
+        assert df.to_dict("records") == [t.model_dump() for t in transactions]
+        assert df["line_number"].tolist() == [2, 3, 4, 5]
+
+
+class TestReadHead:
+    """Tests for the format-detection file head."""
+
+    def test_read_head_trims_to_whole_lines(self):
+        """Test that a long file's head stops at the last complete line."""
+        buffer = io.BytesIO(b"header\n" + b"row,1\n" * 10)
+
+        head = read_head(buffer, size=20)
+
+        assert head == b"header\nrow,1\nrow,1\n"
+        assert buffer.tell() == 0
+
+    def test_read_head_returns_short_file_whole(self):
+        """Test that a file shorter than the head size is returned as is."""
+        assert read_head(io.BytesIO(b"a,b\n1,2"), size=20) == b"a,b\n1,2"
@@ -1,19 +1,28 @@
 """Tests for report generation."""
 
-import tempfile
+import io
+from dataclasses import replace
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
 
+import pandas as pd
 import pytest
 
 from src.models.enums import MatchStatus, TransactionSource
 from src.models.match import MatchResult, MatchScore, ReconciliationSummary
 from src.models.transaction import NormalizedTransaction
-from src.reconciliation.reporter import ReportGenerator
+from src.reconciliation import reporter as reporter_module
+from src.reconciliation.reporter import MATCH_COLUMNS, ReportGenerator
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def reporter():
+    """Shared report generator; it holds only its creation timestamp."""
+    return ReportGenerator()
+
+
+@pytest.fixture(scope="module")
 def sample_transactions():
     """Create sample transactions for testing."""
     source = NormalizedTransaction(
@@ -38,7 +47,7 @@ def sample_transactions():
 
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_match_result(sample_transactions):
     """Create a sample match result."""
     source, target = sample_transactions
@@ -58,7 +67,7 @@ def sample_match_result(sample_transactions):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_summary():
     """Create a sample reconciliation summary."""
     return ReconciliationSummary(
@@ -74,18 +83,26 @@ def sample_summary():
     )
 
 
+@pytest.fixture(scope="module")
+def generated_excel(reporter, sample_match_result, sample_summary, tmp_path_factory):
+    """Excel report for the sample match, written once and shared by readers."""
+    output_path = str(tmp_path_factory.mktemp("report") / "test_report.xlsx")
+    result_path = reporter.generate_excel(
+        [sample_match_result], sample_summary, output_path
+    )
+    return output_path, result_path
+
+
 class TestReportGenerator:
     """Test ReportGenerator class."""
 
-    def test_initialization(self):
+    def test_initialization(self, reporter):
         """Test reporter initialization."""
-        reporter = ReportGenerator()
         assert reporter.generated_at is not None
         assert isinstance(reporter.generated_at, datetime)
 
-    def test_generate_csv(self, sample_match_result):
+    def test_generate_csv(self, sample_match_result, reporter):
         """Test CSV generation."""
-        reporter = ReportGenerator()
         csv_data = reporter.generate_csv([sample_match_result])
 
         assert isinstance(csv_data, str)
@@ -96,34 +113,109 @@ class TestReportGenerator:
         assert "TXN001" in csv_data
         assert "INV001" in csv_data
 
-    def test_generate_csv_bytes(self, sample_match_result):
+    def test_generate_csv_bytes(self, sample_match_result, reporter):
         """Test CSV bytes generation."""
-        reporter = ReportGenerator()
         csv_bytes = reporter.generate_csv_bytes([sample_match_result])
 
         assert isinstance(csv_bytes, bytes)
         assert b"Source Date" in csv_bytes
         assert b"TXN001" in csv_bytes
 
+    def test_generate_csv_round_trips(self, sample_match_result, reporter):
+        """Test that CSV output quotes awkward text and matches the bytes form."""
+        source = replace(
+            sample_match_result.source_transaction,
+            description='Paid "ABC", Corp',
+        )
+        match = sample_match_result.model_copy(update={"source_transaction": source})
 
+        csv_data = reporter.generate_csv([match])
+        df = pd.read_csv(io.StringIO(csv_data))
+
+        assert list(df.columns) == list(MATCH_COLUMNS)
+        assert df["Source Description"].tolist() == ['Paid "ABC", Corp']
+        assert df["Source Amount"].tolist() == [1500.0]
+        assert reporter.generate_csv_bytes([match]) == csv_data.encode("utf-8")
+
+
+
+    def test_generate_csv_keeps_exact_amounts(self, sample_match_result, reporter):
+        """Test that amounts are exported as the exact Decimal, not whole cents."""
+        source = replace(
+            sample_match_result.source_transaction, amount=Decimal("1.005")
+        )
+        match = sample_match_result.model_copy(update={"source_transaction": source})
 
-    def test_generate_excel(self, sample_match_result, sample_summary):
+        df = pd.read_csv(io.StringIO(reporter.generate_csv([match])), dtype=str)
+
+        assert df["Source Amount"].tolist() == ["1.005"]
+        assert df["Target Amount"].tolist() == ["1500.00"]
+
+    def test_generate_excel(self, generated_excel):
         """Test Excel generation."""
-        reporter = ReportGenerator()
+        output_path, result_path = generated_excel
+
+        assert result_path == output_path
+        assert Path(output_path).exists()
+        assert Path(output_path).stat().st_size > 0
+
+    def test_generate_excel_sheets(self, generated_excel):
+        """Test that the Excel report has a header row and one row per match."""
+        output_path, _ = generated_excel
+        sheets = pd.read_excel(output_path, sheet_name=None)
+
+        assert list(sheets) == ["Summary", "Matched"]
+        assert len(sheets["Summary"]) == 10
+        matched = sheets["Matched"]
+        assert list(matched.columns) == list(MATCH_COLUMNS)
+        assert matched["Source Reference"].tolist() == ["TXN001"]
+        assert matched["Target Amount"].tolist() == [1500.0]
+        assert matched["Confidence"].tolist() == ["86%"]
+
+    def test_generate_excel_fast_matches_generate_excel(
+        self, sample_match_result, sample_summary, reporter, tmp_path
+    ):
+        """Test that the streamed workbook holds the same sheets and values."""
+        source = replace(
+            sample_match_result.source_transaction,
+            description='Paid <ABC> & "Co"',
+        )
+        match = sample_match_result.model_copy(update={"source_transaction": source})
+
+        slow_path = str(tmp_path / "slow.xlsx")
+        fast_path = str(tmp_path / "fast.xlsx")
+        reporter.generate_excel([match], sample_summary, slow_path)
+        reporter.generate_excel_fast([match], sample_summary, fast_path)
+
+        slow = pd.read_excel(slow_path, sheet_name=None)
+        fast = pd.read_excel(fast_path, sheet_name=None)
+
+        assert list(fast) == list(slow)
+        for name, frame in slow.items():
+            pd.testing.assert_frame_equal(fast[name], frame)
+
+    def test_generate_excel_streams_large_reports(
+        self, sample_match_result, sample_summary, reporter, tmp_path, monkeypatch
+    ):
+        """Test that reports past the threshold go through the streaming writer."""
+        calls = []
+        monkeypatch.setattr(reporter_module, "_STREAM_EXCEL_MIN_MATCHES", 1)
+        monkeypatch.setattr(
+            reporter,
+            "generate_excel_fast",
+            lambda *args: calls.append(args) or args[2],
+        )
+        output_path = str(tmp_path / "large.xlsx")
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            output_path = str(Path(tmpdir) / "test_report.xlsx")
-            result_path = reporter.generate_excel(
-                [sample_match_result], sample_summary, output_path
-            )
+        result = reporter.generate_excel(
+            [sample_match_result], sample_summary, output_path
+        )
 
-            assert result_path == output_path
-            assert Path(output_path).exists()
-            assert Path(output_path).stat().st_size > 0
+        assert result == output_path
+        assert len(calls) == 1
 
-    def test_summary_to_df(self, sample_summary):
+    def test_summary_to_df(self, sample_summary, reporter):
         """Test summary to DataFrame conversion."""
-        reporter = ReportGenerator()
         df = reporter._summary_to_df(sample_summary)
 
         assert len(df) == 10  # 10 metrics
@@ -132,20 +224,31 @@ class TestReportGenerator:
         assert "Total Source Transactions" in df["Metric"].values
         assert "Match Rate" in df["Metric"].values
 
-    def test_matches_to_df(self, sample_match_result):
-        """Test matches to DataFrame conversion."""
-        reporter = ReportGenerator()
-        df = reporter._matches_to_df([sample_match_result])
+    def test_match_rows(self, sample_match_result, reporter):
+        """Test that a match becomes one row in MATCH_COLUMNS order."""
+        (row,) = reporter._match_rows([sample_match_result])
+        values = dict(zip(MATCH_COLUMNS, row, strict=True))
 
-        assert len(df) == 1
-        assert "Source Date" in df.columns
-        assert "Target Amount" in df.columns
-        assert "Confidence" in df.columns
-        assert df.iloc[0]["Source Reference"] == "TXN001"
-        assert df.iloc[0]["Target Reference"] == "INV001"
+        assert values["Source Reference"] == "TXN001"
+        assert values["Target Reference"] == "INV001"
+        assert values["Confidence"] == "86%"
 
-    def test_matches_to_df_multiple_statuses(self, sample_transactions):
-        """Test DataFrame with different match statuses."""
+    def test_match_rows_truncate_descriptions(self, sample_match_result, reporter):
+        """Test that descriptions are cut to 50 characters in every export."""
+        source = replace(sample_match_result.source_transaction, description="x" * 80)
+        match = sample_match_result.model_copy(update={"source_transaction": source})
+
+        (row,) = reporter._match_rows([match])
+        csv_df = pd.read_csv(io.StringIO(reporter.generate_csv([match])))
+
+        assert row[MATCH_COLUMNS.index("Source Description")] == "x" * 50
+        assert row[MATCH_COLUMNS.index("Target Description")] == (
+            "ABC Corporation payment"
+        )
+        assert csv_df["Source Description"].tolist() == ["x" * 50]
+
+    def test_match_rows_multiple_statuses(self, sample_transactions, reporter):
+        """Test rows with different match statuses."""
         source, target = sample_transactions
         score = MatchScore(
             amount_score=0.7,
@@ -178,10 +281,13 @@ class TestReportGenerator:
             ),
         ]
 
-        reporter = ReportGenerator()
-        df = reporter._matches_to_df(matches)
+        rows = list(reporter._match_rows(matches))
+        status = MATCH_COLUMNS.index("Status")
 
-        assert len(df) == 3
-        assert df["Status"].tolist() == ["matched", "manual_review", "unmatched"]
+        assert [row[status] for row in rows] == [
+            "matched",
+            "manual_review",
+            "unmatched",
+        ]
 
 
@@ -1,13 +1,18 @@
 """Tests for ZIPIT parser."""
 
-import tempfile
-from pathlib import Path
+import io
 
 import pytest
 
 from src.parsers.zipit import ZIPITParser
 
 
+@pytest.fixture(scope="module")
+def zipit_parser():
+    """Shared parser; ZIPITParser holds no per-file state."""
+    return ZIPITParser()
+
+
 @pytest.fixture
 def valid_zipit_content():
     """Sample valid ZIPIT file content."""
@@ -40,178 +45,139 @@ Another invalid line
 class TestZIPITParser:
     """Test ZIPIT parser."""
 
-    def test_validate_valid_file(self, valid_zipit_content):
+    def test_validate_valid_file(self, valid_zipit_content, zipit_parser):
         """Test validation of valid ZIPIT file."""
-        parser = ZIPITParser()
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(valid_zipit_content)
-            temp_path = f.name
+        assert zipit_parser.validate(io.BytesIO(valid_zipit_content.encode())) is True
 
-        try:
-            assert parser.validate(temp_path) is True
-        finally:
-            Path(temp_path).unlink()
-
-    def test_validate_invalid_file(self, invalid_zipit_content):
+    def test_validate_invalid_file(self, invalid_zipit_content, zipit_parser):
         """Test validation of invalid ZIPIT file."""
-        parser = ZIPITParser()
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(invalid_zipit_content)
-            temp_path = f.name
-
-        try:
-            assert parser.validate(temp_path) is False
-        finally:
-            Path(temp_path).unlink()
+        assert (
+            zipit_parser.validate(io.BytesIO(invalid_zipit_content.encode())) is False
+        )
 
-    def test_validate_empty_file(self):
+    def test_validate_empty_file(self, zipit_parser):
         """Test validation of empty file."""
-        parser = ZIPITParser()
+        assert zipit_parser.validate(io.BytesIO(b"")) is False
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write("")
-            temp_path = f.name
-
-        try:
-            assert parser.validate(temp_path) is False
-        finally:
-            Path(temp_path).unlink()
-
-    def test_validate_nonexistent_file(self):
+    def test_validate_nonexistent_file(self, zipit_parser):
         """Test validation of nonexistent file."""
-        parser = ZIPITParser()
-        assert parser.validate("/nonexistent/file.txt") is False
-
-    def test_parse_valid_file(self, valid_zipit_content):
-        """Test parsing valid ZIPIT file."""
-        parser = ZIPITParser()
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(valid_zipit_content)
-            temp_path = f.name
-
-        try:
-            transactions = parser.parse(temp_path)
-
-            assert len(transactions) == 3
-
-            # Check first transaction
-            assert transactions[0].raw_date == "15/01/2024"
-            assert transactions[0].raw_reference == "ZIP001"
-            assert transactions[0].raw_amount == "1500.00"
-            assert "ABC Corp" in transactions[0].description
-
-            # Check second transaction
-            assert transactions[1].raw_date == "16/01/2024"
-            assert transactions[1].raw_reference == "ZIP002"
-            assert transactions[1].raw_amount == "250.50"
-
-            # Check third transaction with different date format
-            assert transactions[2].raw_date == "17-01-2024"
-            assert transactions[2].raw_reference == "ZIP003"
-            assert transactions[2].raw_amount == "3000"
-
-        finally:
-            Path(temp_path).unlink()
-
-    def test_parse_with_comments(self):
-        """Test parsing file with comment lines."""
-        content = """# This is a comment
-15/01/2024 | ZIP001 | 1500.00 | Payment
-# Another comment
-16/01/2024 | ZIP002 | 250.50 | Transfer
-"""
-        parser = ZIPITParser()
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            transactions = parser.parse(temp_path)
-            assert len(transactions) == 2  # Comments should be skipped
-        finally:
-            Path(temp_path).unlink()
-
-    def test_parse_with_empty_lines(self):
-        """Test parsing file with empty lines."""
-        content = """15/01/2024 | ZIP001 | 1500.00 | Payment
-
-16/01/2024 | ZIP002 | 250.50 | Transfer
-
-"""
-        parser = ZIPITParser()
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(content)
-            temp_path = f.name
-
-        try:
-            transactions = parser.parse(temp_path)
-            assert len(transactions) == 2  # Empty lines should be skipped
-        finally:
-            Path(temp_path).unlink()
-
-    def test_parse_mixed_content(self, mixed_zipit_content):
-        """Test parsing file with mixed valid/invalid lines."""
-        parser = ZIPITParser()
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(mixed_zipit_content)
-            temp_path = f.name
-
-        try:
-            transactions = parser.parse(temp_path)
-            # Should only parse valid lines
-            assert len(transactions) == 2
-            assert transactions[0].raw_reference == "ZIP001"
-            assert transactions[1].raw_reference == "ZIP002"
-        finally:
-            Path(temp_path).unlink()
-
-    def test_parse_amount_with_commas(self):
+        assert zipit_parser.validate("/nonexistent/file.txt") is False
+
+    def test_parse_valid_file(self, valid_zipit_content, tmp_path, zipit_parser):
+        """Test parsing valid ZIPIT file from disk."""
+        file_path = tmp_path / "export.txt"
+        file_path.write_text(valid_zipit_content)
+
+        transactions = zipit_parser.parse(str(file_path))
+
+        assert len(transactions) == 3
+        assert transactions[0].source_file == "export.txt"
+
+        # Check first transaction
+        assert transactions[0].raw_date == "15/01/2024"
+        assert transactions[0].raw_reference == "ZIP001"
+        assert transactions[0].raw_amount == "1500.00"
+        assert "ABC Corp" in transactions[0].description
+
+        # Check second transaction
+        assert transactions[1].raw_date == "16/01/2024"
+        assert transactions[1].raw_reference == "ZIP002"
+        assert transactions[1].raw_amount == "250.50"
+
+        # Check third transaction with different date format
+        assert transactions[2].raw_date == "17-01-2024"
+        assert transactions[2].raw_reference == "ZIP003"
+        assert transactions[2].raw_amount == "3000"
+
+    def test_parse_text_matches_parse(self, valid_zipit_content, zipit_parser):
+        """Test that in-memory text parses the same as a buffer."""
+        buffer = io.BytesIO(valid_zipit_content.encode())
+        buffer.name = "export.txt"
+
+        from_text = zipit_parser.parse_text(valid_zipit_content, "export.txt")
+        assert from_text == zipit_parser.parse(buffer)
+        assert zipit_parser.parse_text(valid_zipit_content)[0].source_file == "<memory>"
+
+    @pytest.mark.parametrize(
+        ("content", "expected_refs"),
+        [
+            (
+                "# This is a comment\n"
+                "15/01/2024 | ZIP001 | 1500.00 | Payment\n"
+                "# Another comment\n"
+                "16/01/2024 | ZIP002 | 250.50 | Transfer\n",
+                ["ZIP001", "ZIP002"],
+            ),
+            (
+                "15/01/2024 | ZIP001 | 1500.00 | Payment\n"
+                "\n"
+                "16/01/2024 | ZIP002 | 250.50 | Transfer\n"
+                "\n",
+                ["ZIP001", "ZIP002"],
+            ),
+            (
+                "15/01/2024 | ZIP001 | 1500.00 | Payment from ABC Corp\n"
+                "This is not a valid line\n"
+                "16/01/2024 | ZIP002 | 250.50 | Transfer to XYZ Ltd\n"
+                "Another invalid line\n",
+                ["ZIP001", "ZIP002"],
+            ),
+        ],
+        ids=["comments", "empty_lines", "mixed_content"],
+    )
+    def test_parse_skips_non_transaction_lines(
+        self, zipit_parser, content, expected_refs
+    ):
+        """Test that comments, blank lines and invalid lines are skipped."""
+        transactions = zipit_parser.parse_text(content)
+        assert [t.raw_reference for t in transactions] == expected_refs
+
+    def test_parse_amount_with_commas(self, zipit_parser):
         """Test parsing amounts with comma separators."""
         content = "15/01/2024 | ZIP001 | 1,500.00 | Payment\n"
-        parser = ZIPITParser()
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(content)
-            temp_path = f.name
 
-        try:
-            transactions = parser.parse(temp_path)
-            # Commas should be removed
-            assert transactions[0].raw_amount == "1500.00"
-        finally:
-            Path(temp_path).unlink()
+        transactions = zipit_parser.parse_text(content)
+        # Commas should be removed
+        assert transactions[0].raw_amount == "1500.00"
 
-    def test_parse_sanitizes_values(self):
+    def test_parse_sanitizes_values(self, zipit_parser):
         """Test that CSV injection characters are sanitized."""
         content = "15/01/2024 | ZIP001 | 1500.00 | =MALICIOUS_FORMULA()\n"
-        parser = ZIPITParser()
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
-            f.write(content)
-            temp_path = f.name
+        transactions = zipit_parser.parse_text(content)
+        # Formula prefix should be removed
+        assert not transactions[0].description.startswith("=")
 
-        try:
-            transactions = parser.parse(temp_path)
-            # Formula prefix should be removed
-            assert not transactions[0].description.startswith("=")
-        finally:
-            Path(temp_path).unlink()
+    def test_parse_accepts_non_breaking_space_separators(self, zipit_parser):
+        """Test that Unicode whitespace around separators is tolerated."""
+        content = "15/01/2024\u00a0|\u00a0ZIP001 | 1,500.00 |\u00a0Payment\n"
 
-    def test_line_pattern_regex(self):
-        """Test the LINE_PATTERN regex directly."""
-        parser = ZIPITParser()
+        (transaction,) = zipit_parser.parse_text(content)
+
+        assert transaction.raw_reference == "ZIP001"
+        assert transaction.raw_amount == "1500.00"
+        assert transaction.description == "Payment"
+
+    def test_parse_frame_matches_parse(self, mixed_zipit_content, zipit_parser):
+        """Test that the columnar parse path agrees with parse()."""
+        buffer = io.BytesIO(
+            (mixed_zipit_content + "17/01/2024 | ZIP003 | 1,000.00 | =CMD\n").encode()
+        )
 
+        df = zipit_parser.parse_frame(buffer)
+        transactions = zipit_parser.parse(buffer)
+        assert df.to_dict("records") == [t.model_dump() for t in transactions]
+        assert df["line_number"].tolist() == [1, 3, 5]
+
+    def test_line_pattern_regex(self, zipit_parser):
+        """Test the LINE_PATTERN regex directly."""
         # Valid patterns
-        assert parser.LINE_PATTERN.match("15/01/2024 | ZIP001 | 1500.00 | Payment")
-        assert parser.LINE_PATTERN.match("15-01-2024 | ABC123 | 1,500.00 | Test")
+        assert zipit_parser.LINE_PATTERN.match(
+            "15/01/2024 | ZIP001 | 1500.00 | Payment"
+        )
+        assert zipit_parser.LINE_PATTERN.match("15-01-2024 | ABC123 | 1,500.00 | Test")
 
         # Invalid patterns
-        assert not parser.LINE_PATTERN.match("Invalid line")
-        assert not parser.LINE_PATTERN.match("15/01/2024,ZIP001,1500.00,Payment")
-        assert not parser.LINE_PATTERN.match("")
+        assert not zipit_parser.LINE_PATTERN.match("Invalid line")
+        assert not zipit_parser.LINE_PATTERN.match("15/01/2024,ZIP001,1500.00,Payment")
+        assert not zipit_parser.LINE_PATTERN.match("")